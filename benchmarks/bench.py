@@ -0,0 +1,240 @@
+
+"""
+	Benchmarks for parsing, intersection, choosing and dependency files.
+
+	Run from the repository root:
+
+		python benchmarks/bench.py                       # report ops/sec and peak memory
+		python benchmarks/bench.py --save baseline.json  # store the results as a baseline
+		python benchmarks/bench.py --compare baseline.json --threshold 0.25  # flag slowdowns
+
+	Baselines depend on the machine, so none is committed: record one locally from the reference version
+	and compare against it on the same hardware.
+"""
+
+from argparse import ArgumentParser
+from functools import reduce
+from json import dump, load
+from os.path import abspath, dirname
+from random import Random
+from timeit import default_timer
+from tracemalloc import start, stop, get_traced_memory, reset_peak
+import sys
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from package_versions import (VersionRange, VersionCatalog, parse_dependency, parse_dependencies,
+	str2nr, nr2str, selection_cache)
+
+
+def release_list(count, seed=7):
+	""" Version strings with a mix of bugfix parts, in random order. """
+	rnd = Random(seed)
+	return ['{0:d}.{1:d}{2:s}'.format(rnd.randint(0, 300), rnd.randint(0, 300), rnd.choice(('', '.1', '.2.dev', '.post3')))
+		for k in range(count)]
+
+
+def selections(count, seed=7):
+	""" Selection strings like in requirement files. """
+	rnd = Random(seed)
+	result = []
+	for k in range(count):
+		low = rnd.randint(0, 200)
+		result.append(rnd.choice((
+			'>={0:d}.{1:d},<{2:d}'.format(low, rnd.randint(0, 9), low + rnd.randint(1, 50)),
+			'=={0:d}.*'.format(low),
+			'>{0:d}'.format(low),
+			'<={0:d}.{1:d}'.format(low, rnd.randint(0, 9)),
+		)))
+	return result
+
+
+def requirement_text(lines, names, seed=7):
+	""" Requirement file text with comments, empty lines and duplicate package names. """
+	rnd = Random(seed)
+	parts = []
+	for selection in selections(lines, seed=seed):
+		parts.append('package{0:d}{1:s}'.format(rnd.randint(0, names - 1), selection))
+		if rnd.random() < 0.05:
+			parts.append('# comment')
+		if rnd.random() < 0.05:
+			parts.append('')
+	return '\n'.join(parts)
+
+
+def intersection_chain(depth, seed=7):
+	""" Ranges that mostly overlap, to be intersected one after the other. """
+	rnd = Random(seed)
+	return [VersionRange('>={0:d}.{1:d},<{2:d}'.format(rnd.randint(0, 50), rnd.randint(0, 9), rnd.randint(100, 300)))
+		for k in range(depth)]
+
+
+def bench_range_init(size):
+	texts = selections(size)
+	def run():
+		for text in texts:
+			VersionRange(text)
+	return run, size
+
+
+def bench_range_init_repeated(size):
+	""" A few selections that are used over and over, like in a large set of requirement files. """
+	texts = selections(50) * max(size // 50, 1)
+	def run():
+		for text in texts:
+			VersionRange(text)
+	return run, len(texts)
+
+
+def bench_range_init_uncached(size):
+	texts = selections(size)
+	def run():
+		old_size = selection_cache.maxsize
+		selection_cache.resize(0)
+		try:
+			for text in texts:
+				VersionRange(text)
+		finally:
+			selection_cache.resize(old_size)
+	return run, size
+
+
+def bench_add_selections(size):
+	texts = selections(size)
+	def run():
+		vrange = VersionRange()
+		for text in texts:
+			vrange.add_selections(text, conflict='silent')
+	return run, size
+
+
+def bench_intersection(size):
+	chain = intersection_chain(size)
+	def run():
+		reduce(lambda first, second: first & second, chain)
+	return run, size
+
+
+def bench_choose(size):
+	releases = release_list(size)
+	ranges = [VersionRange(text) for text in selections(100)]
+	def run():
+		for vrange in ranges:
+			vrange.choose(releases)
+	return run, len(ranges)
+
+
+def bench_choose_catalog(size):
+	catalog = VersionCatalog(release_list(size))
+	ranges = [VersionRange(text) for text in selections(1000)]
+	def run():
+		for vrange in ranges:
+			vrange.choose(catalog)
+	return run, len(ranges)
+
+
+def bench_convert(size):
+	releases = release_list(size)
+	def run():
+		for version in releases:
+			nr2str(str2nr(version))
+	return run, size
+
+
+def bench_parse_dependency(size):
+	lines = requirement_text(size, names=size).splitlines()
+	def run():
+		for line in lines:
+			parse_dependency(line)
+	return run, len(lines)
+
+
+def bench_parse_dependencies(size):
+	text = requirement_text(size, names=size // 10)
+	def run():
+		parse_dependencies(text)
+	return run, size
+
+
+BENCHMARKS = [
+	('range_init', bench_range_init),
+	('range_init_repeated', bench_range_init_repeated),
+	('range_init_uncached', bench_range_init_uncached),
+	('add_selections', bench_add_selections),
+	('intersection', bench_intersection),
+	('choose', bench_choose),
+	('choose_catalog', bench_choose_catalog),
+	('str2nr_nr2str', bench_convert),
+	('parse_dependency', bench_parse_dependency),
+	('parse_dependencies', bench_parse_dependencies),
+]
+
+
+def measure(factory, size, repeat=5):
+	"""
+	:return: Tuple (ops per second for the fastest run, peak memory in bytes during one run).
+	"""
+	run, ops = factory(size)
+	run()
+	best = None
+	for k in range(repeat):
+		begin = default_timer()
+		run()
+		duration = default_timer() - begin
+		best = duration if best is None else min(best, duration)
+	start()
+	reset_peak()
+	run()
+	peak = get_traced_memory()[1]
+	stop()
+	return ops / max(best, 1e-9), peak
+
+
+def compare(results, baseline, threshold):
+	"""
+	:return: Names of benchmarks that are more than `threshold` (fraction) slower than the baseline.
+	"""
+	slower = []
+	for name, result in results.items():
+		if name not in baseline:
+			continue
+		ratio = result['ops_per_sec'] / baseline[name]['ops_per_sec']
+		flag = ''
+		if ratio < 1 - threshold:
+			slower.append(name)
+			flag = '  SLOWER'
+		print('{0:24s} {1:7.2f}x baseline{2:s}'.format(name, ratio, flag))
+	return slower
+
+
+def main(argv=None):
+	parser = ArgumentParser(description='Benchmark package_versions.')
+	parser.add_argument('--size', type=int, default=10000, help='Size of the generated inputs (default: %(default)s).')
+	parser.add_argument('--repeat', type=int, default=5, help='Timed runs per benchmark (default: %(default)s).')
+	parser.add_argument('--only', nargs='*', help='Names of benchmarks to run.')
+	parser.add_argument('--save', help='Store results as a JSON baseline.')
+	parser.add_argument('--compare', help='Compare with a JSON baseline and exit with 1 on slowdowns.')
+	parser.add_argument('--threshold', type=float, default=0.25, help='Allowed fraction of slowdown (default: %(default)s).')
+	args = parser.parse_args(argv)
+	results = {}
+	for name, factory in BENCHMARKS:
+		if args.only and name not in args.only:
+			continue
+		ops_per_sec, peak = measure(factory, args.size, repeat=args.repeat)
+		results[name] = {'ops_per_sec': ops_per_sec, 'peak_bytes': peak, 'size': args.size}
+		print('{0:24s} {1:12.0f} ops/s {2:10.1f} KiB peak'.format(name, ops_per_sec, peak / 1024.))
+	if args.save:
+		with open(args.save, 'w') as fh:
+			dump(results, fh, indent=1, sort_keys=True)
+	if args.compare:
+		with open(args.compare, 'r') as fh:
+			baseline = load(fh)
+		if compare(results, baseline, args.threshold):
+			return 1
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
+
+
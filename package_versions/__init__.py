@@ -1,6 +1,22 @@
 
 from .settings import *
 from .convert import *
+from .cache import *
+from .instrument import *
+from .conflicts import *
+from .catalog import *
 from .versions import *
+from .streaming import *
+from .incremental import *
+from .merge import *
+from .index import *
+from .rangeset import *
+from .serialize import *
+from .sqlstore import *
+from .snapshot import *
+from .resolver import *
+from .lockfile import *
+from .versionarray import *
+from .batch import *
 
 
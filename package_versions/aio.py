@@ -0,0 +1,115 @@
+
+"""
+	Asynchronous version lookups, for versions that come from (several) mirrors or on-disk indexes.
+
+	This module needs Python 3.5+ and is not imported by the package itself; use `from package_versions.aio import ...`.
+"""
+
+import asyncio
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from logging import warning
+from .catalog import VersionCatalog
+from .settings import VersionRangeMismatch, VERSION_MAX
+from .versions import parse_dependencies
+
+
+class VersionProvider(metaclass=ABCMeta):
+	"""
+	Source of available versions. Subclasses can set `timeout` (seconds) to override the one of the resolver.
+	"""
+	timeout = None
+
+	@abstractmethod
+	async def versions(self, name):
+		"""
+		:return: Iterable of the available version strings for the package, empty if it is unknown.
+		"""
+
+
+class StaticProvider(VersionProvider):
+	"""
+	Provider for versions that are already in memory, as a mapping from package names to versions.
+	"""
+	def __init__(self, versions, timeout=None):
+		self.known = versions
+		self.timeout = timeout
+
+	async def versions(self, name):
+		return self.known.get(name, ())
+
+
+class AsyncResolver(object):
+	"""
+	Choose versions using several providers, which are queried concurrently.
+
+	Versions from all providers are combined. A provider that takes longer than its timeout is skipped with a warning.
+	Lookups are cached per package name, and at most `concurrency` provider queries run at the same time.
+	"""
+	def __init__(self, providers, concurrency=8, timeout=None, mx=VERSION_MAX):
+		"""
+		:param timeout: Seconds to wait for each provider, unless the provider has its own `timeout`.
+		"""
+		self.providers = list(providers)
+		self.concurrency = concurrency
+		self.timeout = timeout
+		self.limit = mx
+		self.cache = {}
+		self.lookups = {}
+		self.semaphore = None
+
+	async def _query(self, provider, name):
+		loop = asyncio.get_event_loop()
+		if self.semaphore is None or self.semaphore[0] is not loop:
+			self.semaphore = (loop, asyncio.Semaphore(self.concurrency))
+		timeout = self.timeout if provider.timeout is None else provider.timeout
+		async with self.semaphore[1]:
+			try:
+				return await asyncio.wait_for(provider.versions(name), timeout)
+			except asyncio.TimeoutError:
+				warning('Provider {0:} timed out after {1:}s looking up "{2:s}"'.format(provider, timeout, name))
+				return ()
+
+	async def _fetch(self, name):
+		results = await asyncio.gather(*(self._query(provider, name) for provider in self.providers))
+		catalog = VersionCatalog((version for versions in results for version in versions), mx=self.limit)
+		self.cache[name] = catalog
+		return catalog
+
+	async def catalog(self, name):
+		"""
+		:return: VersionCatalog with the versions of the package from all providers.
+		"""
+		if name in self.cache:
+			return self.cache[name]
+		lookup = self.lookups.get(name)
+		if lookup is None:
+			lookup = self.lookups[name] = asyncio.ensure_future(self._fetch(name))
+		try:
+			return await lookup
+		finally:
+			self.lookups.pop(name, None)
+
+	async def choose(self, name, vrange, conflict='silent'):
+		"""
+		Like `VersionRange.choose`, with the versions of the package from the providers.
+		"""
+		catalog = await self.catalog(name)
+		if not catalog:
+			raise VersionRangeMismatch('No versions found for package "{0:s}"'.format(name))
+		return vrange.choose(catalog, conflict=conflict)
+
+	async def resolve_dependencies(self, dependencies, conflict='silent'):
+		"""
+		Choose a version for each dependency, looking them up concurrently.
+
+		:param dependencies: Result of `parse_dependencies`, or text to give to it.
+		:return: OrderedDict from package names to chosen versions.
+		"""
+		if isinstance(dependencies, str):
+			dependencies = parse_dependencies(dependencies)
+		names = list(dependencies)
+		chosen = await asyncio.gather(*(self.choose(name, dependencies[name], conflict=conflict) for name in names))
+		return OrderedDict(zip(names, chosen))
+
+
@@ -0,0 +1,165 @@
+
+"""
+	Operations on many ranges and versions at once, vectorized with numpy when it is available.
+"""
+
+from collections import OrderedDict
+from .catalog import VersionCatalog
+from .conflicts import ConflictEvent, version_problem_notify
+from .convert import str2nr, str2nr3
+from .settings import VersionRangeMismatch, VERSION_MAX
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+
+def encode_versions(versions, mx=VERSION_MAX, wide=False):
+	"""
+	Encode version strings to numbers (using `to_nr`), as an int64 array if numpy is available.
+
+	:param wide: Include the patch number (using `to_nr3` with VERSION_WIDE_MAX instead of `mx`).
+	"""
+	if wide:
+		numbers = [str2nr3(version) for version in versions]
+	else:
+		numbers = [str2nr(version, mx=mx) for version in versions]
+	if numpy is None:
+		return numbers
+	return numpy.array(numbers, dtype=numpy.int64)
+
+
+def range_bounds(ranges, wide=False):
+	"""
+	The lower and upper bounds of the ranges, as two int64 arrays if numpy is available.
+
+	:param wide: Give the bounds in the encoding that includes the patch number (see `wide_bounds`).
+	"""
+	if wide:
+		bounds = [vrange.wide_bounds() for vrange in ranges]
+		mins = [mn for mn, mx in bounds]
+		maxs = [mx for mn, mx in bounds]
+	else:
+		mins = [vrange.min for vrange in ranges]
+		maxs = [vrange.max for vrange in ranges]
+	if numpy is None:
+		return mins, maxs
+	return numpy.array(mins, dtype=numpy.int64), numpy.array(maxs, dtype=numpy.int64)
+
+
+def contains_each(ranges, numbers, wide=False):
+	"""
+	For pairs of ranges and encoded versions, whether each version is in its range.
+
+	:param numbers: Encoded versions (see `encode_versions`), as many as there are ranges.
+	:param wide: Whether the versions were encoded with the patch number.
+	"""
+	mins, maxs = range_bounds(ranges, wide=wide)
+	assert len(mins) == len(numbers)
+	if numpy is None:
+		return [mn <= nr <= mx for mn, nr, mx in zip(mins, numbers, maxs)]
+	numbers = numpy.asarray(numbers, dtype=numpy.int64)
+	return (mins <= numbers) & (numbers <= maxs)
+
+
+def contains_mask(ranges, numbers, wide=False):
+	"""
+	Matrix of which versions are in which ranges, with a row per range and a column per version.
+
+	:param numbers: Encoded versions (see `encode_versions`).
+	:param wide: Whether the versions were encoded with the patch number.
+	"""
+	mins, maxs = range_bounds(ranges, wide=wide)
+	if numpy is None:
+		return [[mn <= nr <= mx for nr in numbers] for mn, mx in zip(mins, maxs)]
+	numbers = numpy.asarray(numbers, dtype=numpy.int64)
+	return (mins[:, None] <= numbers[None, :]) & (numbers[None, :] <= maxs[:, None])
+
+
+def choose_batch(ranges, versions, conflict='silent', mx=VERSION_MAX):
+	"""
+	Choose a version for each of the ranges, giving the same results as `VersionRange.choose`.
+
+	:param versions: Iterable of available versions, or a VersionCatalog.
+	:return: List with the chosen version for each range.
+	"""
+	if not isinstance(versions, VersionCatalog) or versions.limit != mx:
+		versions = VersionCatalog(versions, mx=mx)
+	ranges = list(ranges)
+	assert all(vrange.limit == mx for vrange in ranges)
+	if numpy is None:
+		return _sweep_choose(ranges, versions, conflict)
+	if not ranges:
+		return []
+	if not versions:
+		return [vrange.choose(versions, conflict=conflict) for vrange in ranges]
+	numbers = numpy.array(versions.numbers, dtype=numpy.int64)
+	ordered = versions.ordered
+	mins, maxs = range_bounds(ranges)
+	above = numpy.searchsorted(numbers, maxs, side='right')
+	inside = above - 1
+	in_range = (inside >= 0) & (numbers[numpy.maximum(inside, 0)] >= mins)
+	above_range = (above < len(numbers)) & (numbers[numpy.minimum(above, len(numbers) - 1)] < versions.highest_nr)
+	highest = versions.highest()
+	chosen = []
+	for k, vrange in enumerate(ranges):
+		if in_range[k]:
+			chosen.append(ordered[inside[k]])
+			continue
+		if conflict != 'silent':
+			version_problem_notify(ConflictEvent('no_match', ranges=(vrange,), options=versions, mx=mx), conflict=conflict)
+		if above_range[k]:
+			chosen.append(ordered[above[k]])
+		else:
+			chosen.append(highest)
+	return chosen
+
+
+def _sweep_choose(ranges, catalog, conflict):
+	"""
+	Choose for each range by visiting the ranges in order of their maximum and the sorted versions once.
+	"""
+	if not ranges:
+		return []
+	if not catalog:
+		raise VersionRangeMismatch('No versions to choose from')
+	numbers, ordered, count = catalog.numbers, catalog.ordered, len(catalog.numbers)
+	highest = catalog.highest()
+	chosen = [None] * len(ranges)
+	position = 0
+	for k in sorted(range(len(ranges)), key=lambda k: ranges[k].max):
+		vrange = ranges[k]
+		while position < count and numbers[position] <= vrange.max:
+			position += 1
+		if position > 0 and numbers[position - 1] >= vrange.min:
+			chosen[k] = ordered[position - 1]
+		elif position < count and numbers[position] < catalog.highest_nr:
+			chosen[k] = ordered[position]
+		else:
+			chosen[k] = highest
+	if conflict != 'silent':
+		for vrange in ranges:
+			if catalog.highest_in(vrange.min, vrange.max) is None:
+				version_problem_notify(ConflictEvent('no_match', ranges=(vrange,), options=catalog, mx=catalog.limit), conflict=conflict)
+	return chosen
+
+
+def choose_all(dependencies, versions, conflict='silent', mx=VERSION_MAX):
+	"""
+	Choose a version for each package from one shared list of versions, giving the same results as `VersionRange.choose`.
+
+	The versions are sorted once and the ranges are handled in a single pass over them.
+
+	:param dependencies: Mapping from package names to ranges, like from `parse_dependencies`.
+	:param versions: Iterable of available versions, or a VersionCatalog.
+	:return: OrderedDict from package names to the chosen versions.
+	"""
+	if not isinstance(versions, VersionCatalog) or versions.limit != mx:
+		versions = VersionCatalog(versions, mx=mx)
+	names = list(dependencies.keys())
+	ranges = [dependencies[name] for name in names]
+	assert all(vrange.limit == mx for vrange in ranges)
+	return OrderedDict(zip(names, _sweep_choose(ranges, versions, conflict)))
+
+
@@ -0,0 +1,59 @@
+
+"""
+	Small bounded caches for repeated parsing work.
+"""
+
+from collections import OrderedDict, namedtuple
+
+
+CacheInfo = namedtuple('CacheInfo', ('hits', 'misses', 'maxsize', 'currsize'))
+
+
+class LRUCache(object):
+	"""
+	Mapping with at most `maxsize` items, which evicts the least recently used one when full.
+
+	A maxsize of 0 disables the cache. Hits and misses are counted, see `info`.
+	"""
+	def __init__(self, maxsize=128):
+		self.maxsize = maxsize
+		self.data = OrderedDict()
+		self.hits = self.misses = 0
+
+	def get(self, key, default=None):
+		try:
+			value = self.data.pop(key)
+		except KeyError:
+			self.misses += 1
+			return default
+		self.data[key] = value
+		self.hits += 1
+		return value
+
+	def put(self, key, value):
+		if self.maxsize <= 0:
+			return
+		self.data.pop(key, None)
+		self.data[key] = value
+		if len(self.data) > self.maxsize:
+			self.data.popitem(last=False)
+
+	def resize(self, maxsize):
+		self.maxsize = maxsize
+		while len(self.data) > max(maxsize, 0):
+			self.data.popitem(last=False)
+
+	def clear(self):
+		self.data.clear()
+		self.hits = self.misses = 0
+
+	def info(self):
+		return CacheInfo(self.hits, self.misses, self.maxsize, len(self.data))
+
+	def __len__(self):
+		return len(self.data)
+
+	def __contains__(self, key):
+		return key in self.data
+
+
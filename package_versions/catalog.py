@@ -0,0 +1,151 @@
+
+"""
+	Sorted collection of available versions, so that ranges can pick from it quickly.
+"""
+
+from bisect import bisect_left, bisect_right
+from operator import itemgetter
+from .convert import str2nrrest, rest_key
+from .settings import VERSION_MAX
+
+
+class VersionCatalog(object):
+	"""
+	Parse a list of versions once and keep the encoded numbers sorted.
+
+	Lookups for a range use binary search, so a catalog can be reused for many `choose` or `rank` calls
+	on the same releases. Versions are sorted by number and then by the rest (see `version_sort_key`);
+	equal versions keep the order in which they were given.
+	"""
+	def __init__(self, versions=(), mx=VERSION_MAX):
+		"""
+		:param versions: Iterable of available version strings.
+		"""
+		self.limit = mx
+		self.versions = []
+		seen = set()
+		for version in versions:
+			if version not in seen:
+				seen.add(version)
+				self.versions.append(version)
+		triples = [str2nrrest(version, mx=mx) + (version,) for version in self.versions]
+		triples.sort(key=itemgetter(0))
+		self.numbers = [nr for nr, rest, version in triples]
+		start = 0
+		while start < len(triples):
+			end = bisect_right(self.numbers, self.numbers[start], start)
+			if end - start > 1:
+				""" Only parse the rest for versions with the same number. """
+				triples[start:end] = sorted(triples[start:end], key=lambda triple: rest_key(triple[1]))
+			start = end
+		self.ordered = [version for nr, rest, version in triples]
+
+	def with_versions(self, versions):
+		"""
+		A new catalog that also contains the given versions, leaving this one unchanged.
+
+		Only the new versions are parsed; they are merged into copies of the sorted lists.
+		"""
+		added, seen = [], set()
+		for version in versions:
+			if version in seen:
+				continue
+			seen.add(version)
+			nr, rest = str2nrrest(version, mx=self.limit)
+			if version not in self.ordered[bisect_left(self.numbers, nr):bisect_right(self.numbers, nr)]:
+				added.append((nr, rest_key(rest), version))
+		if not added:
+			return self
+		inserts = []
+		for nr, key, version in sorted(added, key=lambda triple: triple[:2]):
+			index = bisect_left(self.numbers, nr)
+			while index < len(self.numbers) and self.numbers[index] == nr and \
+					rest_key(str2nrrest(self.ordered[index], mx=self.limit)[1]) <= key:
+				index += 1
+			inserts.append((index, nr, version))
+		catalog = VersionCatalog(mx=self.limit)
+		catalog.versions = self.versions + [version for nr, key, version in added]
+		previous = 0
+		for index, nr, version in inserts:
+			catalog.numbers.extend(self.numbers[previous:index])
+			catalog.ordered.extend(self.ordered[previous:index])
+			catalog.numbers.append(nr)
+			catalog.ordered.append(version)
+			previous = index
+		catalog.numbers.extend(self.numbers[previous:])
+		catalog.ordered.extend(self.ordered[previous:])
+		return catalog
+
+	@property
+	def highest_nr(self):
+		return (self.limit + 1) * self.limit
+
+	def __len__(self):
+		return len(self.versions)
+
+	def __iter__(self):
+		return iter(self.versions)
+
+	def __contains__(self, version):
+		return version in self.versions
+
+	def highest_in(self, min, max):
+		"""
+		The highest version with a number in [min, max], or None.
+		"""
+		index = bisect_right(self.numbers, max) - 1
+		if index >= 0 and self.numbers[index] >= min:
+			return self.ordered[index]
+		return None
+
+	def in_range(self, min, max):
+		"""
+		All versions with a number in [min, max], from low to high.
+		"""
+		return self.ordered[bisect_left(self.numbers, min):bisect_right(self.numbers, max)]
+
+	def lowest_above(self, max):
+		"""
+		The lowest version with a number above max (but below the overall maximum), or None.
+		"""
+		index = bisect_right(self.numbers, max)
+		if index < len(self.numbers) and self.numbers[index] < self.highest_nr:
+			return self.ordered[index]
+		return None
+
+	def highest(self):
+		"""
+		The highest version overall, or None if there are no versions above 0.0.
+		"""
+		if not self.numbers or self.numbers[-1] <= 0:
+			return None
+		return self.ordered[-1]
+
+	def rank(self, vrange):
+		"""
+		Generate all versions in the order `choose` prefers them: in the range from high to low, then above the range
+		from low to high, then below the range from high to low. Versions below the range are included; only versions
+		at 0.0 and, outside the range, at the highest possible number are skipped.
+
+		The first version is the one `choose` returns; each next one takes constant time.
+		"""
+		low = bisect_left(self.numbers, vrange.min)
+		high = bisect_right(self.numbers, vrange.max)
+		for index in range(high - 1, low - 1, -1):
+			yield self.ordered[index]
+		for index in range(high, len(self.numbers)):
+			if self.numbers[index] >= self.highest_nr:
+				break
+			yield self.ordered[index]
+		for index in range(low - 1, -1, -1):
+			if self.numbers[index] <= 0:
+				break
+			yield self.ordered[index]
+
+	def choose(self, vrange, conflict='silent'):
+		return vrange.choose(self, conflict=conflict)
+
+	def __repr__(self):
+		return '{0:s}({1:d} versions)'.format(self.__class__.__name__, len(self))
+
+
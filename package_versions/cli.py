@@ -0,0 +1,137 @@
+
+"""
+	Command line tool to parse many requirement files in parallel, merge them and choose versions.
+"""
+
+from argparse import ArgumentParser
+from fnmatch import fnmatch
+from json import dumps, load
+from multiprocessing import Pool, cpu_count
+from os import walk
+from os.path import isdir, join
+import sys
+from time import time
+from .catalog import VersionCatalog
+from .conflicts import ConflictCollector, version_problem_notify
+from .merge import merge_dependency_sets
+from .settings import VersionFormatError, VersionRangeMismatch
+from .streaming import read_dependencies
+
+
+def find_files(paths, pattern='*.txt'):
+	"""
+	The given files, plus the files matching the pattern inside the given directories (recursively).
+	"""
+	for path in paths:
+		if isdir(path):
+			for root, dirs, files in walk(path):
+				dirs.sort()
+				for name in sorted(files):
+					if fnmatch(name, pattern):
+						yield join(root, name)
+		else:
+			yield path
+
+
+def parse_file(path):
+	"""
+	:return: Tuple (path, dependencies, error), where either dependencies or error is None.
+	"""
+	try:
+		return path, read_dependencies(path), None
+	except (VersionFormatError, VersionRangeMismatch, IOError, UnicodeDecodeError) as err:
+		return path, None, str(err)
+
+
+def load_catalog(path):
+	"""
+	Read a JSON file that maps package names to lists of available versions.
+	"""
+	with open(path, 'r') as fh:
+		return load(fh)
+
+
+def make_parser():
+	parser = ArgumentParser(prog='package-versions', description='Parse requirement files in parallel, merge them per package and choose versions.')
+	parser.add_argument('paths', nargs='+', help='Requirement files, or directories to search for them.')
+	parser.add_argument('--pattern', default='*.txt', help='Filename pattern for files in directories (default: %(default)s).')
+	parser.add_argument('--catalog', help='JSON file with available versions per package, like {"name": ["1.0", "1.1"]}.')
+	parser.add_argument('--output', help='File to write JSON lines to (default: standard output).')
+	parser.add_argument('--workers', type=int, default=cpu_count(), help='Number of processes (default: %(default)s).')
+	parser.add_argument('--chunksize', type=int, default=16, help='Files per task sent to a worker (default: %(default)s).')
+	parser.add_argument('--conflict', choices=('silent', 'warning', 'error'), default='warning',
+		help='What to do if a package has ranges that do not overlap or no version in range (default: %(default)s).')
+	parser.add_argument('--timing', action='store_true', help='Print a timing summary to standard error.')
+	return parser
+
+
+def main(argv=None):
+	"""
+	Write a JSON line per file that could not be parsed, and one per package with its merged range and chosen version
+	(and whether that version is in the range). With `--conflict error`, a package whose ranges don't overlap or that
+	has no version in range gets a line with the error instead.
+
+	:return: Exit code, which is 1 if any file could not be parsed, a package is not in the catalog, a chosen version
+		is not in its range, or a package has an error.
+	"""
+	args = make_parser().parse_args(argv)
+	start = time()
+	files = list(find_files(args.paths, pattern=args.pattern))
+	catalog = load_catalog(args.catalog) if args.catalog else None
+	out = open(args.output, 'w') if args.output else sys.stdout
+	status = 0
+	try:
+		if args.workers > 1 and len(files) > 1:
+			pool = Pool(processes=args.workers)
+			try:
+				results = pool.map(parse_file, files, chunksize=max(args.chunksize, 1))
+			finally:
+				pool.close()
+				pool.join()
+		else:
+			results = [parse_file(path) for path in files]
+		parsed = time()
+		dependency_sets = []
+		for path, dependencies, error in results:
+			if error is not None:
+				out.write(dumps({'file': path, 'error': error}) + '\n')
+				status = 1
+			else:
+				dependency_sets.append(dependencies)
+		problems = ConflictCollector()
+		merged = merge_dependency_sets(dependency_sets, conflict=problems)
+		no_overlap = dict((event.package, event) for event in problems)
+		for name, vrange in merged.items():
+			line = {'package': name, 'range': str(vrange)}
+			events = [no_overlap[name]] if name in no_overlap else []
+			if catalog is not None and not (events and args.conflict == 'error'):
+				if catalog.get(name):
+					problems.clear()
+					line['version'] = vrange.choose(VersionCatalog(catalog[name], mx=vrange.limit), conflict=problems)
+					line['in_range'] = not problems
+					if problems:
+						events.extend(problems)
+						status = 1
+				else:
+					line['version'] = None
+					status = 1
+			if events and args.conflict == 'error':
+				line = {'package': name, 'error': ' '.join(str(event) for event in events)}
+				status = 1
+			else:
+				for event in events:
+					version_problem_notify(event, conflict=args.conflict)
+			out.write(dumps(line) + '\n')
+	finally:
+		if out is not sys.stdout:
+			out.close()
+	if args.timing:
+		sys.stderr.write('{0:d} files, {1:d} packages; parsing {2:.3f}s, merging and choosing {3:.3f}s, total {4:.3f}s\n'.format(
+			len(files), len(merged), parsed - start, time() - parsed, time() - start))
+	return status
+
+
+if __name__ == '__main__':
+	sys.exit(main())
+
+
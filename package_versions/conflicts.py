@@ -0,0 +1,108 @@
+
+"""
+	Conflicts between version requirements, as events that are only turned into text when they are logged or raised.
+"""
+
+from logging import warning
+from .convert import to_tup
+from .settings import VersionRangeMismatch, VERSION_MAX
+
+
+CONFLICT_MESSAGES = {
+	'min_conflict': 'Minimum {bounds[0]:s} conflicts with maximum {bounds[1]:s}; minimum is higher so it takes precedence, '
+		'but lower values in range are not preferred.',
+	'max_conflict': 'Maximum {bounds[0]:s} conflicts with minimum {bounds[1]:s}; minimum is higher so takes it precedence, '
+		'but lower values in range are now preferred.',
+	'no_match': 'No matching version found for range "{ranges[0]:s}" from options "{options:s}"; '
+		'other options might be considered.',
+	'duplicate': 'Package with name "{package:s}" appeared twice: "{ranges[0]:s}" and "{ranges[1]:s}"',
+	'no_overlap': 'Ranges {ranges_list:s} do not overlap; minimum {bounds[0]:s} takes precedence, '
+		'but lower values in range are preferred.',
+	'package_no_overlap': 'Package with name "{package:s}" has ranges that do not overlap: {ranges_list:s}; '
+		'using "{result:s}".',
+}
+
+
+class ConflictEvent(object):
+	"""
+	A conflict, with the kind (a key of `CONFLICT_MESSAGES`) and the data needed to describe it.
+
+	:param bounds: Encoded version numbers involved, like (new minimum, current maximum).
+	:param ranges: Ranges involved.
+	:param options: Versions that were available to choose from.
+	:param result: The range that was used instead, if any.
+	"""
+	__slots__ = ('kind', 'package', 'bounds', 'ranges', 'options', 'result', 'limit')
+
+	def __init__(self, kind, package=None, bounds=(), ranges=(), options=(), result=None, mx=VERSION_MAX):
+		self.kind = kind
+		self.package = package
+		self.bounds = bounds
+		self.ranges = ranges
+		self.options = options
+		self.result = result
+		self.limit = mx
+
+	@property
+	def message(self):
+		return CONFLICT_MESSAGES[self.kind].format(
+			package=self.package,
+			bounds=['{0:d}.{1:d}'.format(*to_tup(nr, mx=self.limit)) for nr in self.bounds],
+			ranges=[str(vrange) for vrange in self.ranges],
+			ranges_list=', '.join('"{0:s}"'.format(vrange) for vrange in self.ranges),
+			options='/'.join(str(version) for version in self.options),
+			result=str(self.result),
+		)
+
+	def __str__(self):
+		return self.message
+
+	def __repr__(self):
+		return '{0:s}({1:s}{2:s})'.format(self.__class__.__name__, self.kind,
+			', {0:s}'.format(self.package) if self.package else '')
+
+
+class ConflictCollector(object):
+	"""
+	Handler that can be passed as `conflict` to keep the events, to inspect them in batch later.
+	"""
+	def __init__(self):
+		self.events = []
+
+	def __call__(self, event):
+		self.events.append(event)
+
+	def __len__(self):
+		return len(self.events)
+
+	def __iter__(self):
+		return iter(self.events)
+
+	def clear(self):
+		self.events = []
+
+
+def check_conflict_mode(conflict):
+	assert conflict in ('silent', 'warning', 'error') or callable(conflict), \
+		'conflict should be "silent", "warning", "error" or a handler, not {0!r}'.format(conflict)
+
+
+def version_problem_notify(event, conflict):
+	"""
+	Report a conflict (a ConflictEvent or text).
+
+	:param conflict: 'silent' to ignore it, 'warning' to log it, 'error' to raise VersionRangeMismatch with it,
+		or a callable that is given the event.
+	"""
+	if conflict == 'silent':
+		return
+	elif conflict == 'warning':
+		warning('%s', event)
+	elif conflict == 'error':
+		raise VersionRangeMismatch(event)
+	elif callable(conflict):
+		conflict(event)
+	else:
+		raise NotImplementedError('Unknown conflict mode "{0:}"'.format(conflict))
+
+
@@ -1,5 +1,11 @@
 
-from .settings import VERSION_MAX, VersionTooHigh
+from re import compile as re_compile
+from .settings import VERSION_MAX, VERSION_WIDE_MAX, VersionTooHigh
+
+
+REST_PART_REGEX = re_compile(r'[0-9]+|[a-zA-Z]+')
+PATCH_REGEX = re_compile(r'(\d*)\.?(.*)$')
+PRE_RELEASE_TAGS = {'dev': 0, 'a': 1, 'alpha': 1, 'b': 2, 'beta': 2, 'c': 3, 'pre': 3, 'preview': 3, 'rc': 3}
 
 
 def str2nrrest(txt, mx=VERSION_MAX):
@@ -43,3 +49,85 @@ def to_nr(major, minor, mx=VERSION_MAX):
 	return major * mx + minor
 
 
+def str2nr3rest(txt, mx=VERSION_WIDE_MAX):
+	"""
+	Like `str2nrrest`, but also encodes the patch number (the leading digits after the minor version).
+
+	The rest is what follows the patch number and an optional period. Converting back with `nr3rest2str`
+	gives the normalized form 'major.minor.patch[.rest]', so '1.0.dev1' becomes '1.0.0.dev1' and '2.9.10rc1'
+	becomes '2.9.10.rc1'; those have the same number and rest.
+	"""
+	nr, rest = str2nrrest(txt, mx=mx)
+	patch, rest = PATCH_REGEX.match(rest).groups()
+	patch = int(patch) if patch else 0
+	if not patch < mx - 1:
+		raise VersionTooHigh('version too high (patch={0:d}, limit={1:d})'.format(patch, mx))
+	return nr * mx + patch, rest
+
+
+def nr3rest2str(nr, rest, mx=VERSION_WIDE_MAX):
+	"""
+	The normalized version string 'major.minor.patch[.rest]', see `str2nr3rest`.
+	"""
+	major, minor, patch = to_tup3(nr, mx=mx)
+	if not major < mx - 1:
+		raise VersionTooHigh('version too high (input//limit**2={0:d}//{1:d}={2:d})'.format(nr, mx ** 2, major))
+	return '{0:d}.{1:d}.{2:d}'.format(major, minor, patch) + ('.{0:s}'.format(rest) if rest else '')
+
+
+def str2nr3(txt, mx=VERSION_WIDE_MAX):
+	return str2nr3rest(txt, mx=mx)[0]
+
+
+def to_tup3(nr, mx=VERSION_WIDE_MAX):
+	return nr // (mx * mx), nr // mx % mx, nr % mx
+
+
+def to_nr3(major, minor, patch, mx=VERSION_WIDE_MAX):
+	return (major * mx + minor) * mx + patch
+
+
+def rest_key(rest):
+	"""
+	Comparable key for the part of a version after major.minor.
+
+	Numbers compare as numbers and above words (so '9' < '10' and 'post' < '0'); other characters only separate parts.
+	Pre-release tags (see `PRE_RELEASE_TAGS`) sort below the end of the version, so '9rc1' < '9' and 'dev1' < '',
+	while other words sort above it, so '' < 'post1'.
+	"""
+	key = []
+	for part in REST_PART_REGEX.findall(rest):
+		if part.isdigit():
+			key.append((2, int(part), ''))
+		else:
+			part = part.lower()
+			if part in PRE_RELEASE_TAGS:
+				key.append((-1, PRE_RELEASE_TAGS[part], part))
+			else:
+				key.append((1, 0, part))
+	key.append((0, 0, ''))
+	return tuple(key)
+
+
+def version_sort_key(txt, mx=VERSION_MAX):
+	"""
+	Key to sort version strings by their encoded number and then by the rest.
+	"""
+	nr, rest = str2nrrest(txt, mx=mx)
+	return nr, rest_key(rest)
+
+
+def sort_versions(versions, reverse=False, mx=VERSION_MAX):
+	"""
+	Sort version strings, parsing each version once. Equal versions keep their order.
+	"""
+	return sorted(versions, key=lambda version: version_sort_key(version, mx=mx), reverse=reverse)
+
+
+def max_version(versions, mx=VERSION_MAX):
+	"""
+	The highest of the version strings (the first one if there are several equal ones).
+	"""
+	return max(versions, key=lambda version: version_sort_key(version, mx=mx))
+
+
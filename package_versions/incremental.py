@@ -0,0 +1,74 @@
+
+"""
+	Parse dependency text again after edits, without repeating the work for lines that did not change.
+"""
+
+from collections import OrderedDict
+from .versions import parse_dependency, merge_dependencies
+
+
+class IncrementalParser(object):
+	"""
+	Keeps the parsed lines of a dependency text, so that `update` only parses lines with new content
+	and only merges the ranges again for names whose lines changed.
+
+	The result is the same as `parse_dependencies` on the full text. Duplicate notifications are given
+	for names that are merged again. Ranges in the result are shared with the parser, so should not be modified.
+	"""
+	def __init__(self, txt='', duplicates='silent'):
+		"""
+		:param duplicates: What to do for repeated names: 'silent', 'warning' or 'error'.
+		"""
+		self.duplicates = duplicates
+		self.lines = []
+		self.line_cache = {}
+		self.occurrences = {}
+		self.merged = {}
+		self.dependencies = OrderedDict()
+		self.update(txt)
+
+	def parse_line(self, line):
+		if line not in self.line_cache:
+			self.line_cache[line] = parse_dependency(line)
+		return self.line_cache[line]
+
+	def update(self, txt):
+		"""
+		Set the full new text.
+
+		:return: The merged dependencies, like `parse_dependencies`.
+		"""
+		return self.update_lines(txt.splitlines())
+
+	def replace(self, start, stop, lines):
+		"""
+		Replace lines [start, stop) by the given lines, e.g. from a diff.
+
+		:return: The merged dependencies, like `parse_dependencies`.
+		"""
+		new_lines = list(self.lines)
+		new_lines[start:stop] = lines
+		return self.update_lines(new_lines)
+
+	def update_lines(self, lines):
+		lines = list(lines)
+		occurrences = OrderedDict()
+		for line in lines:
+			result = self.parse_line(line)
+			if result:
+				occurrences.setdefault(result[0], []).append(line)
+		for name, name_lines in occurrences.items():
+			if self.occurrences.get(name) != name_lines:
+				self.merged[name] = merge_dependencies((self.parse_line(line) for line in name_lines),
+					duplicates=self.duplicates)[name]
+		for name in set(self.occurrences) - set(occurrences):
+			del self.merged[name]
+		present = set(lines)
+		for line in set(self.line_cache) - present:
+			del self.line_cache[line]
+		self.lines = lines
+		self.occurrences = occurrences
+		self.dependencies = OrderedDict((name, self.merged[name]) for name in occurrences)
+		return self.dependencies
+
+
@@ -0,0 +1,166 @@
+
+"""
+	Reverse lookup from versions to the ranges that accept them.
+"""
+
+from random import Random
+from .convert import str2nr
+from .settings import VERSION_MAX
+
+
+class _Node(object):
+	__slots__ = ('key', 'owner', 'min', 'max', 'high', 'priority', 'left', 'right')
+
+	def __init__(self, key, owner, min, max, priority):
+		self.key = key
+		self.owner = owner
+		self.min = min
+		self.max = max
+		self.high = max
+		self.priority = priority
+		self.left = self.right = None
+
+
+def _update(node):
+	high = node.max
+	if node.left is not None and node.left.high > high:
+		high = node.left.high
+	if node.right is not None and node.right.high > high:
+		high = node.right.high
+	node.high = high
+
+
+def _rotate_right(node):
+	top = node.left
+	node.left, top.right = top.right, node
+	_update(node)
+	_update(top)
+	return top
+
+
+def _rotate_left(node):
+	top = node.right
+	node.right, top.left = top.left, node
+	_update(node)
+	_update(top)
+	return top
+
+
+def _insert(node, new):
+	if node is None:
+		return new
+	if new.key < node.key:
+		node.left = _insert(node.left, new)
+		if node.left.priority > node.priority:
+			return _rotate_right(node)
+	else:
+		node.right = _insert(node.right, new)
+		if node.right.priority > node.priority:
+			return _rotate_left(node)
+	_update(node)
+	return node
+
+
+def _delete(node, key):
+	if key < node.key:
+		node.left = _delete(node.left, key)
+	elif key > node.key:
+		node.right = _delete(node.right, key)
+	else:
+		if node.left is None:
+			return node.right
+		if node.right is None:
+			return node.left
+		if node.left.priority > node.right.priority:
+			node = _rotate_right(node)
+			node.right = _delete(node.right, key)
+		else:
+			node = _rotate_left(node)
+			node.left = _delete(node.left, key)
+	_update(node)
+	return node
+
+
+class RangeIndex(object):
+	"""
+	Index of ranges by owner (e.g. the name of the dependent package), to find the owners whose range
+	contains a version, or overlaps with another range.
+
+	This is an interval tree: a treap ordered by lower bound, where each node knows the highest upper bound
+	in its subtree. Inserting and removing take O(log n) expected time; queries skip every subtree that
+	cannot match, so they take about O(log n) per result.
+	"""
+	def __init__(self, ranges=(), mx=VERSION_MAX, seed=None):
+		"""
+		:param ranges: Mapping or iterable of (owner, range) pairs.
+		"""
+		self.limit = mx
+		self.root = None
+		self.ranges = {}
+		self.keys = {}
+		self.counter = 0
+		self.random = Random(seed)
+		if hasattr(ranges, 'items'):
+			ranges = ranges.items()
+		for owner, vrange in ranges:
+			self.insert(owner, vrange)
+
+	def __len__(self):
+		return len(self.ranges)
+
+	def __contains__(self, owner):
+		return owner in self.ranges
+
+	def __getitem__(self, owner):
+		return self.ranges[owner]
+
+	def insert(self, owner, vrange):
+		"""
+		Add the range for the owner, replacing the previous one if there was any.
+		"""
+		if owner in self.ranges:
+			self.remove(owner)
+		self.counter += 1
+		key = (vrange.min, self.counter)
+		self.root = _insert(self.root, _Node(key, owner, vrange.min, vrange.max, self.random.random()))
+		self.ranges[owner] = vrange
+		self.keys[owner] = key
+
+	def remove(self, owner):
+		"""
+		:raise KeyError: If the owner is not in the index.
+		"""
+		key = self.keys.pop(owner)
+		del self.ranges[owner]
+		self.root = _delete(self.root, key)
+
+	def _overlapping(self, low, high):
+		found = []
+		stack = [self.root]
+		while stack:
+			node = stack.pop()
+			if node is None or node.high < low:
+				continue
+			if node.min <= high:
+				stack.append(node.right)
+				if node.max >= low:
+					found.append(node)
+			stack.append(node.left)
+		found.sort(key=lambda node: node.key)
+		return [node.owner for node in found]
+
+	def containing(self, version):
+		"""
+		Owners whose range contains the version (a string or encoded number), ordered by lower bound.
+		"""
+		if not isinstance(version, int):
+			version = str2nr(version, mx=self.limit)
+		return self._overlapping(version, version)
+
+	def overlapping(self, vrange):
+		"""
+		Owners whose range has at least one version in common with the given range, ordered by lower bound.
+		"""
+		return self._overlapping(vrange.min, vrange.max)
+
+
@@ -0,0 +1,63 @@
+
+"""
+	Optional counters and timings for the hot paths, to find out where time goes.
+"""
+
+from collections import defaultdict
+
+
+class Instrumentation(object):
+	"""
+	Counters and cumulative timings per operation, which are only collected after `enable`.
+
+	Instrumented code checks `enabled` before doing anything else, so the overhead when disabled
+	is a single attribute lookup. Callbacks are called as callback(event, count, duration), where
+	duration is None for plain counters.
+
+	Events: 'range_cached' and 'range_parse' (construction of VersionRange), 'conflict' (in update_values),
+	'choose_in_range', 'choose_above', 'choose_highest' and 'choose_none' (the branch that `choose` took),
+	'dependency_lines', 'dependency_duplicates' and 'parse_dependencies'.
+	"""
+	def __init__(self):
+		self.enabled = False
+		self.counts = defaultdict(int)
+		self.timings = defaultdict(float)
+		self.callbacks = []
+
+	def enable(self):
+		self.enabled = True
+
+	def disable(self):
+		self.enabled = False
+
+	def reset(self):
+		self.counts.clear()
+		self.timings.clear()
+
+	def add_callback(self, callback):
+		self.callbacks.append(callback)
+
+	def remove_callback(self, callback):
+		self.callbacks.remove(callback)
+
+	def count(self, event, amount=1):
+		self.counts[event] += amount
+		for callback in self.callbacks:
+			callback(event, amount, None)
+
+	def timed(self, event, duration):
+		self.counts[event] += 1
+		self.timings[event] += duration
+		for callback in self.callbacks:
+			callback(event, 1, duration)
+
+	def snapshot(self):
+		"""
+		Copy of the current counts and cumulative timings (in seconds), as {'counts': {...}, 'timings': {...}}.
+		"""
+		return {'counts': dict(self.counts), 'timings': dict(self.timings)}
+
+
+instrumentation = Instrumentation()
+
+
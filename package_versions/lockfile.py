@@ -0,0 +1,166 @@
+
+"""
+	Keep resolved versions on disk, so they only need to be checked instead of resolved on the next run.
+"""
+
+from collections import OrderedDict, deque
+from hashlib import sha256
+from json import dump, load
+from os.path import exists
+from .resolver import Resolver
+from .settings import VersionRangeMismatch, VERSION_MAX
+from .versions import FrozenVersionRange, parse_dependencies
+
+try:
+	from os import replace
+except ImportError:
+	from os import rename as replace
+
+
+LOCK_FORMAT = 1
+
+
+def dependencies_digest(dependencies):
+	"""
+	Hash of parsed dependencies, which does not depend on their order or on how the ranges were written.
+	"""
+	digest = sha256()
+	for name in sorted(dependencies):
+		vrange = dependencies[name]
+		digest.update('{0:s} {1:d} {2:d} {3:d}\n'.format(name, vrange.min, vrange.max, vrange.prefer_highest).encode('utf-8'))
+	return digest.hexdigest()
+
+
+def catalog_digest(index, names):
+	"""
+	Hash of the versions and their dependencies in the index, for the given packages.
+	"""
+	digest = sha256()
+	for name in sorted(names):
+		digest.update('{0:s}\n'.format(name).encode('utf-8'))
+		for version, txt in sorted((index.get(name) or {}).items()):
+			if not isinstance(txt, str):
+				txt = '\n'.join(txt or ())
+			digest.update('{0:s}\n{1:s}\n\n'.format(version, txt or '').encode('utf-8'))
+	return digest.hexdigest()
+
+
+class LockFile(object):
+	"""
+	Resolve requirements against an index (see `Resolver`), keeping the result in a json lock file.
+
+	If the requirements and the relevant part of the index did not change, the locked versions are used as they are.
+	Otherwise each locked version is checked once, and only the packages whose version is no longer valid are resolved again.
+	"""
+	def __init__(self, path, index, mx=VERSION_MAX):
+		self.path = path
+		self.index = index
+		self.resolver = Resolver(index, mx=mx)
+		self.stats = {}
+
+	def load(self):
+		""" The content of the lock file, or None if there is no (usable) lock file. """
+		if not exists(self.path):
+			return None
+		with open(self.path, 'r') as fh:
+			lock = load(fh)
+		if lock.get('format') != LOCK_FORMAT:
+			return None
+		return lock
+
+	def save(self, requirements_digest, versions):
+		lock = OrderedDict((
+			('format', LOCK_FORMAT),
+			('requirements', requirements_digest),
+			('catalog', catalog_digest(self.index, versions)),
+			('versions', versions),
+		))
+		tmp_path = '{0:s}.tmp'.format(self.path)
+		with open(tmp_path, 'w') as fh:
+			dump(lock, fh, indent=1)
+		replace(tmp_path, self.path)
+
+	def validate(self, requirements, locked):
+		"""
+		Check the locked versions in one pass over the packages that are (transitively) required.
+
+		If the ranges for a package don't overlap, or its locked version is outside them, that package and
+		the locked packages that require it are all invalid.
+
+		:return: The valid locked versions, and the set of names that need a new version.
+		"""
+		valid = OrderedDict()
+		invalid = set()
+		ranges = OrderedDict((name, vrange if isinstance(vrange, FrozenVersionRange) else vrange.freeze())
+			for name, vrange in requirements.items())
+		required_by = {}
+		pending = deque(requirements)
+		while pending:
+			name = pending.popleft()
+			if name in valid or name in invalid:
+				continue
+			version = locked.get(name)
+			if version is None or version not in (self.index.get(name) or {}) or version not in ranges[name]:
+				invalid.add(name)
+				continue
+			valid[name] = version
+			for dep, vrange in self.resolver.dependencies(name, version).items():
+				required_by.setdefault(dep, []).append(name)
+				try:
+					ranges[dep] = ranges[dep].intersection(vrange, conflict='error') if dep in ranges else vrange
+				except VersionRangeMismatch:
+					ranges[dep] = ranges[dep] & vrange
+					self._invalidate([dep] + required_by[dep], valid, invalid)
+					continue
+				if dep in valid and valid[dep] not in ranges[dep]:
+					self._invalidate([dep] + required_by[dep], valid, invalid)
+					continue
+				pending.append(dep)
+		return valid, invalid
+
+	@staticmethod
+	def _invalidate(names, valid, invalid):
+		for name in names:
+			valid.pop(name, None)
+			invalid.add(name)
+
+	def resolve(self, requirements):
+		"""
+		The versions for the requirements, using the lock file where possible, and update the lock file.
+
+		:param requirements: Text (see `parse_dependencies`) or a mapping from package names to ranges.
+		:return: OrderedDict from package names to chosen versions.
+
+		Afterwards, `stats` contains 'status' (which is 'locked' if nothing changed, 'validated' if the locked versions
+		were all still valid, 'partial' if some were resolved again, or 'resolved' without usable lock) and 'invalid'.
+		"""
+		if isinstance(requirements, str):
+			requirements = parse_dependencies(requirements)
+		requirements_digest = dependencies_digest(requirements)
+		lock = self.load()
+		if lock is not None:
+			locked = OrderedDict(lock['versions'])
+			if lock['requirements'] == requirements_digest and lock['catalog'] == catalog_digest(self.index, locked):
+				self.stats = {'status': 'locked', 'invalid': []}
+				return locked
+			valid, invalid = self.validate(requirements, locked)
+			if not invalid:
+				self.stats = {'status': 'validated', 'invalid': []}
+				versions = valid
+			else:
+				self.stats = {'status': 'partial', 'invalid': sorted(invalid)}
+				versions = self.resolver.resolve(requirements, locked=valid)
+		else:
+			self.stats = {'status': 'resolved', 'invalid': []}
+			versions = self.resolver.resolve(requirements)
+		self.save(requirements_digest, versions)
+		return versions
+
+
+def resolve_locked(requirements, index, path, mx=VERSION_MAX):
+	"""
+	Resolve requirements using and updating a lock file in one go; see `LockFile` for details.
+	"""
+	return LockFile(path, index, mx=mx).resolve(requirements)
+
+
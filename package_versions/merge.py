@@ -0,0 +1,76 @@
+
+"""
+	Combine many ranges or dependency sets at once, instead of pairwise.
+"""
+
+from collections import OrderedDict
+from .conflicts import ConflictEvent, version_problem_notify
+from .settings import VERSION_MAX
+from .versions import VersionRange
+
+
+def _intersect_bounds(ranges, mx):
+	"""
+	Bounds (min, max, prefer_highest, conflicts) of the intersection of the ranges, in one pass.
+
+	If the ranges don't overlap, the highest minimum takes precedence (like it does for `VersionRange.intersection`),
+	with as maximum the lowest one that is still above that minimum, and lower versions are preferred.
+	"""
+	low, high, prefer_highest = 0, (mx + 1) * mx, True
+	maxs = []
+	for vrange in ranges:
+		assert vrange.limit == mx, 'cannot combine ranges with different limits'
+		if vrange.min > low:
+			low = vrange.min
+		if vrange.max < high:
+			high = vrange.max
+		prefer_highest = prefer_highest and vrange.prefer_highest
+		maxs.append(vrange.max)
+	if low <= high:
+		return low, high, prefer_highest, False
+	return low, min(nr for nr in maxs if nr >= low), False, True
+
+
+def intersect_all(ranges, conflict='warning', mx=VERSION_MAX):
+	"""
+	The intersection of any number of ranges, which is '==*' if there are none.
+
+	Unlike repeated `&`, the result does not depend on the order of the ranges, also when they conflict.
+
+	:param conflict: What to do if the ranges don't overlap: 'silent', 'warning', 'error' or a handler.
+	"""
+	ranges = list(ranges)
+	low, high, prefer_highest, conflicts = _intersect_bounds(ranges, mx)
+	intersection = VersionRange.from_bounds(low, high, prefer_highest, mx=mx)
+	if conflicts and conflict != 'silent':
+		version_problem_notify(ConflictEvent('no_overlap', bounds=(low,), ranges=tuple(ranges), result=intersection, mx=mx),
+			conflict=conflict)
+	return intersection
+
+
+def merge_dependency_sets(dependency_sets, conflict='warning', mx=VERSION_MAX):
+	"""
+	Combine the results of several `parse_dependencies` calls into one, intersecting the ranges per package.
+
+	Conflicts are reported once per package, after all sets have been collected.
+
+	:param dependency_sets: Iterable of mappings from package names to ranges.
+	:param conflict: What to do if the ranges for a package don't overlap: 'silent', 'warning', 'error' or a handler.
+	"""
+	collected = OrderedDict()
+	for dependencies in dependency_sets:
+		for name, vrange in dependencies.items():
+			if name in collected:
+				collected[name].append(vrange)
+			else:
+				collected[name] = [vrange]
+	merged = OrderedDict()
+	for name, ranges in collected.items():
+		low, high, prefer_highest, conflicts = _intersect_bounds(ranges, mx)
+		merged[name] = VersionRange.from_bounds(low, high, prefer_highest, mx=mx)
+		if conflicts and conflict != 'silent':
+			version_problem_notify(ConflictEvent('package_no_overlap', package=name, ranges=tuple(ranges),
+				result=merged[name], mx=mx), conflict=conflict)
+	return merged
+
+
@@ -0,0 +1,201 @@
+
+"""
+	Sets of versions that consist of several disjoint ranges.
+"""
+
+from bisect import bisect_right
+from re import compile as re_compile
+from .catalog import VersionCatalog
+from .convert import str2nr
+from .settings import VersionRangeMismatch, VERSION_MAX
+from .conflicts import ConflictEvent, check_conflict_mode, version_problem_notify
+from .versions import VersionRange
+
+
+ALTERNATIVES_REGEX = re_compile(r'\|+|\s+or\s+')
+
+
+def _normalize(intervals):
+	""" Sort intervals and merge the ones that overlap or touch. """
+	merged = []
+	for low, high in sorted(intervals):
+		if low > high:
+			continue
+		if merged and low <= merged[-1][1] + 1:
+			if high > merged[-1][1]:
+				merged[-1] = (merged[-1][0], high)
+		else:
+			merged.append((low, high))
+	return tuple(merged)
+
+
+class VersionRangeSet(object):
+	"""
+	Set of versions made of any number of disjoint ranges, so that unions like '<2.0 or >=3.1'
+	and exclusions like '>=2,!=2.5' can be represented exactly.
+
+	The ranges are stored as sorted, inclusive (min, max) pairs of encoded numbers, like the bounds of
+	`VersionRange`, with gaps between them. Set operations are linear in the number of ranges.
+	Which of the versions in range is preferred is not tracked; `choose` always takes the highest.
+	"""
+	def __init__(self, selections='==*', mx=VERSION_MAX):
+		"""
+		:param selections: Alternatives separated by '|' or 'or', each being selections like for `VersionRange`,
+			which may include exclusions like '!=2.5' or '!=2.*'.
+		"""
+		self.limit = mx
+		intervals = []
+		for alternative in ALTERNATIVES_REGEX.split(selections.strip()):
+			intervals.extend(self._parse_alternative(alternative))
+		self.intervals = _normalize(intervals)
+
+	def _parse_alternative(self, alternative):
+		parts = [part.strip() for part in alternative.split(',')]
+		included = ','.join(part for part in parts if not part.startswith('!='))
+		vrange = VersionRange(included or '==*', mx=self.limit)
+		intervals = ((vrange.min, vrange.max),)
+		for part in parts:
+			if part.startswith('!='):
+				excluded = VersionRange('==' + part[2:], mx=self.limit)
+				intervals = self._difference(intervals, ((excluded.min, excluded.max),))
+		return intervals
+
+	@classmethod
+	def from_intervals(cls, intervals, mx=VERSION_MAX):
+		"""
+		:param intervals: Iterable of inclusive (min, max) pairs of encoded numbers, in any order.
+		"""
+		inst = cls.__new__(cls)
+		inst.limit = mx
+		inst.intervals = _normalize(intervals)
+		return inst
+
+	@classmethod
+	def from_range(cls, vrange):
+		return cls.from_intervals(((vrange.min, vrange.max),), mx=vrange.limit)
+
+	@property
+	def highest(self):
+		return (self.limit + 1) * self.limit
+
+	def ranges(self):
+		"""
+		The parts of this set as a list of `VersionRange`.
+		"""
+		return [VersionRange.from_bounds(low, high, mx=self.limit) for low, high in self.intervals]
+
+	def _complement(self, intervals):
+		gaps = []
+		start = 0
+		for low, high in intervals:
+			if low > start:
+				gaps.append((start, low - 1))
+			start = high + 1
+		if start <= self.highest:
+			gaps.append((start, self.highest))
+		return tuple(gaps)
+
+	@staticmethod
+	def _intersection(first, second):
+		found = []
+		k = j = 0
+		while k < len(first) and j < len(second):
+			low = max(first[k][0], second[j][0])
+			high = min(first[k][1], second[j][1])
+			if low <= high:
+				found.append((low, high))
+			if first[k][1] < second[j][1]:
+				k += 1
+			else:
+				j += 1
+		return tuple(found)
+
+	def _difference(self, first, second):
+		return self._intersection(first, self._complement(second))
+
+	def _check(self, other):
+		if isinstance(other, VersionRange):
+			other = self.from_range(other)
+		if not isinstance(other, VersionRangeSet):
+			raise NotImplementedError('can only combine with {0:s} or VersionRange objects, not {1:s}.'
+				.format(self.__class__.__name__, str(type(other))))
+		assert other.limit == self.limit, 'cannot combine sets with different limits'
+		return other
+
+	def union(self, other):
+		other = self._check(other)
+		return self.from_intervals(self.intervals + other.intervals, mx=self.limit)
+
+	def intersection(self, other):
+		other = self._check(other)
+		return self.from_intervals(self._intersection(self.intervals, other.intervals), mx=self.limit)
+
+	def difference(self, other):
+		other = self._check(other)
+		return self.from_intervals(self._difference(self.intervals, other.intervals), mx=self.limit)
+
+	def complement(self):
+		return self.from_intervals(self._complement(self.intervals), mx=self.limit)
+
+	__or__ = union
+	__and__ = intersection
+	__sub__ = difference
+	__invert__ = complement
+
+	def __contains__(self, version):
+		"""
+		:param version: A version string or encoded number.
+		"""
+		if not isinstance(version, int):
+			version = str2nr(version, mx=self.limit)
+		index = bisect_right(self.intervals, (version, self.highest + 1)) - 1
+		return index >= 0 and version <= self.intervals[index][1]
+
+	def __bool__(self):
+		return bool(self.intervals)
+
+	__nonzero__ = __bool__
+
+	def __eq__(self, other):
+		if not type(self) is type(other):
+			return False
+		return self.intervals == other.intervals and self.limit == other.limit
+
+	def __ne__(self, other):
+		return not self == other
+
+	def __hash__(self):
+		return hash((self.intervals, self.limit))
+
+	def choose(self, versions, conflict='silent'):
+		"""
+		Choose the highest version in the set, falling back to the same options as `VersionRange.choose`.
+
+		:param versions: Iterable of available versions, or a VersionCatalog.
+		"""
+		check_conflict_mode(conflict)
+		if not isinstance(versions, VersionCatalog) or versions.limit != self.limit:
+			versions = VersionCatalog(versions, mx=self.limit)
+		if not versions:
+			raise VersionRangeMismatch('No versions to choose from')
+		for low, high in reversed(self.intervals):
+			top_version = versions.highest_in(low, high)
+			if top_version:
+				return top_version
+		if conflict != 'silent':
+			version_problem_notify(ConflictEvent('no_match', ranges=(self,), options=versions, mx=self.limit), conflict=conflict)
+		if self.intervals:
+			top_version = versions.lowest_above(self.intervals[-1][1])
+			if top_version:
+				return top_version
+		return versions.highest()
+
+	def __str__(self):
+		if not self.intervals:
+			return '!=*'
+		return ' or '.join(str(vrange) for vrange in self.ranges())
+
+	def __repr__(self):
+		return '{1:s}({0:s})'.format(self.__str__(), self.__class__.__name__)
+
+
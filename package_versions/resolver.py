@@ -0,0 +1,289 @@
+
+"""
+	Resolve dependencies transitively, using a local index of packages.
+"""
+
+from collections import OrderedDict, deque
+from time import time
+from .catalog import VersionCatalog
+from .settings import VersionRangeMismatch, VERSION_MAX
+from .versions import FrozenVersionRange, parse_dependencies
+
+
+class Resolver(object):
+	"""
+	Choose a version for each package that is (transitively) required, such that all ranges are satisfied.
+
+	The index maps package names to mappings from version strings to the dependencies of that version,
+	either as text like for `parse_dependencies` or as a list of lines. Versions are tried highest first
+	(like `VersionRange.choose`, but never outside the range), backtracking on conflicts.
+
+	Parsed dependencies and the resolution on its own of each (package, range) that the search reaches
+	are remembered between calls, so shared parts of the dependency graph are resolved once. Those resolutions are used directly
+	when they are compatible with the rest, and otherwise only to skip ranges that cannot be resolved at all.
+	Create a new Resolver if the index changes.
+	"""
+	def __init__(self, index, mx=VERSION_MAX):
+		self.index = index
+		self.limit = mx
+		self.catalogs = {}
+		self.dependency_memo = {}
+		self.subtree_memo = {}
+		self.in_progress = set()
+		self.stats = {}
+
+	def catalog(self, name):
+		catalog = self.catalogs.get(name)
+		if catalog is None:
+			if name not in self.index:
+				raise VersionRangeMismatch('Package "{0:s}" is not in the index'.format(name))
+			catalog = self.catalogs[name] = VersionCatalog(self.index[name], mx=self.limit)
+		return catalog
+
+	def candidates(self, name, vrange):
+		"""
+		Versions of the package that are in the range, most preferred first.
+		"""
+		return self.catalog(name).in_range(vrange.min, vrange.max)[::-1]
+
+	def dependencies(self, name, version):
+		"""
+		The dependencies of a specific version, as an OrderedDict of names and FrozenVersionRanges.
+		"""
+		key = (name, version)
+		dependencies = self.dependency_memo.get(key)
+		if dependencies is None:
+			txt = self.index[name][version] or ''
+			if not isinstance(txt, str):
+				txt = '\n'.join(txt)
+			dependencies = OrderedDict((dep, vrange.freeze()) for dep, vrange in parse_dependencies(txt).items())
+			self.dependency_memo[key] = dependencies
+		return dependencies
+
+	def resolve(self, requirements, locked=None):
+		"""
+		Resolve the requirements and everything they depend on.
+
+		:param requirements: Text (see `parse_dependencies`) or a mapping from package names to ranges.
+		:param locked: Mapping of package names to versions to keep if possible; if they don't fit,
+			everything is resolved again. Locked packages that the requirements no longer need are left out.
+		:return: OrderedDict from package names to chosen versions.
+		:raise VersionRangeMismatch: If there is no combination of versions that satisfies all the ranges.
+
+		Afterwards, `stats` contains the resolution time, the number of versions tried ('nodes'),
+		how many of those failed ('backtracks') and how often an earlier resolution was reused ('memo_hits').
+		"""
+		start = time()
+		self.stats = {'nodes': 0, 'backtracks': 0, 'memo_hits': 0}
+		if isinstance(requirements, str):
+			requirements = parse_dependencies(requirements)
+		constraints = dict((name, self._freeze(vrange)) for name, vrange in requirements.items())
+		try:
+			if locked:
+				try:
+					return self._run(*self._lock(constraints, list(requirements), locked))
+				except VersionRangeMismatch:
+					pass
+			return self._run(OrderedDict(), constraints, list(requirements))
+		finally:
+			self.stats['time'] = time() - start
+
+	@staticmethod
+	def _freeze(vrange):
+		if isinstance(vrange, FrozenVersionRange):
+			return vrange
+		return vrange.freeze()
+
+	def _run(self, chosen, constraints, pending):
+		"""
+		Run a search, and the searches for the resolutions of single packages that it asks for. Each search is
+		a generator (see `_search`). Searches for single packages use earlier resolutions, but don't start new ones,
+		so that deep dependency chains are not resolved again at every level.
+		"""
+		stack = [(None, self._search(chosen, constraints, pending))]
+		reply = None
+		try:
+			while True:
+				key, search = stack[-1]
+				try:
+					request = search.send(reply)
+				except VersionRangeMismatch:
+					if key is None:
+						raise
+					request = ('result', False)
+				if request[0] == 'result':
+					stack.pop()
+					if key is None:
+						return request[1]
+					self.in_progress.discard(key)
+					reply = self.subtree_memo[key] = request[1]
+				elif request[1] in self.subtree_memo:
+					self.stats['memo_hits'] += 1
+					reply = self.subtree_memo[request[1]]
+				elif request[1] in self.in_progress or len(stack) > 1:
+					reply = None
+				else:
+					name, vrange = request[1]
+					self.in_progress.add(request[1])
+					stack.append((request[1], self._search(OrderedDict(), {name: vrange}, [name])))
+					reply = None
+		finally:
+			for key, search in stack:
+				self.in_progress.discard(key)
+
+	def _search(self, chosen, constraints, pending):
+		"""
+		Generator that chooses versions for all pending packages (and their dependencies), with backtracking.
+
+		It yields ('subtree', (name, range)) to get the resolution of that package on its own (see `_run`),
+		and finally ('result', chosen versions), or raises VersionRangeMismatch. Choices are undone using a trail
+		of changes, so the state is not copied for each package.
+		"""
+		constraints = dict(constraints)
+		trail = []
+		frames = []
+		position = 0
+		while True:
+			while position < len(pending) and pending[position] in chosen:
+				position += 1
+			if position == len(pending):
+				yield ('result', OrderedDict(chosen))
+				return
+			name = pending[position]
+			position += 1
+			vrange = constraints[name]
+			subtree = yield ('subtree', (name, vrange))
+			frames.append(_Frame(name, vrange, subtree, len(trail), len(pending), position))
+			""" Try the options of the newest frame; if they run out, go back to earlier frames. """
+			while True:
+				frame = frames[-1]
+				if frame.applied and frame.candidate is not None:
+					self.stats['backtracks'] += 1
+				self._undo(trail, frame.mark)
+				del pending[frame.pending_length:]
+				position = frame.position
+				if self._next_option(frame, chosen, constraints, pending, trail):
+					break
+				frames.pop()
+				if not frames:
+					raise VersionRangeMismatch(frame.failure())
+
+	def _next_option(self, frame, chosen, constraints, pending, trail):
+		""" Apply the next option of the frame that does not conflict directly, or return False if there is none. """
+		if not frame.applied and frame.subtree is False:
+			return False
+		if not frame.applied:
+			frame.applied = True
+			try:
+				frame.candidates = self.candidates(frame.name, frame.vrange)[::-1]
+			except VersionRangeMismatch:
+				frame.candidates = []
+			if frame.subtree:
+				if self._merge(chosen, constraints, frame.subtree, trail):
+					return True
+				self._undo(trail, frame.mark)
+		while frame.candidates:
+			frame.candidate = frame.candidates.pop()
+			self.stats['nodes'] += 1
+			try:
+				self._choose(chosen, constraints, pending, frame.name, frame.candidate, trail)
+				return True
+			except VersionRangeMismatch:
+				self.stats['backtracks'] += 1
+				self._undo(trail, frame.mark)
+				del pending[frame.pending_length:]
+		frame.candidate = None
+		return False
+
+	@staticmethod
+	def _set(mapping, key, value, trail):
+		trail.append((mapping, key, mapping.get(key, _MISSING)))
+		mapping[key] = value
+
+	@staticmethod
+	def _undo(trail, mark):
+		while len(trail) > mark:
+			mapping, key, old = trail.pop()
+			if old is _MISSING:
+				del mapping[key]
+			else:
+				mapping[key] = old
+
+	def _choose(self, chosen, constraints, pending, name, version, trail):
+		""" Add a version and its dependencies to the state, or raise VersionRangeMismatch if it conflicts. """
+		self._set(chosen, name, version, trail)
+		for dep, vrange in self.dependencies(name, version).items():
+			if dep in constraints:
+				vrange = constraints[dep].intersection(vrange, conflict='error')
+			if dep in chosen:
+				if chosen[dep] not in vrange:
+					raise VersionRangeMismatch('Version "{0:s}" of "{1:s}" is not in range "{2:s}"'.format(chosen[dep], dep, vrange))
+			else:
+				pending.append(dep)
+			self._set(constraints, dep, vrange, trail)
+
+	def _lock(self, constraints, pending, locked):
+		"""
+		State with the locked versions chosen, or raise VersionRangeMismatch if they conflict. Only locked packages
+		that are reached from the requirements through other locked packages are used.
+		"""
+		chosen = OrderedDict()
+		constraints = dict(constraints)
+		trail = []
+		reached = deque(pending)
+		while reached:
+			name = reached.popleft()
+			if name in chosen or name not in locked:
+				continue
+			version = locked[name]
+			if name not in self.index or version not in self.index[name]:
+				raise VersionRangeMismatch('Locked version "{0:s}" of "{1:s}" is not in the index'.format(version, name))
+			self._choose(chosen, constraints, pending, name, version, trail)
+			reached.extend(self.dependencies(name, version))
+		for name, version in chosen.items():
+			if name in constraints and version not in constraints[name]:
+				raise VersionRangeMismatch('Locked version "{0:s}" of "{1:s}" is not in range "{2:s}"'.format(version, name, constraints[name]))
+		return chosen, constraints, pending
+
+	def _merge(self, chosen, constraints, subtree, trail):
+		""" Add a resolution of a package to the chosen versions, or return False if they conflict. """
+		for name, version in subtree.items():
+			if name in chosen:
+				if chosen[name] != version:
+					return False
+			elif name in constraints and version not in constraints[name]:
+				return False
+			else:
+				self._set(chosen, name, version, trail)
+		return True
+
+
+_MISSING = object()
+
+
+class _Frame(object):
+	""" A package that a version was chosen for during search, with the options that are left. """
+	def __init__(self, name, vrange, subtree, mark, pending_length, position):
+		self.name = name
+		self.vrange = vrange
+		self.subtree = subtree
+		self.mark = mark
+		self.pending_length = pending_length
+		self.position = position
+		self.applied = False
+		self.candidates = None
+		self.candidate = None
+
+	def failure(self):
+		if self.subtree is False:
+			return 'Dependencies of "{0:s}" with range "{1:s}" cannot be resolved'.format(self.name, self.vrange)
+		return 'No version of "{0:s}" in range "{1:s}" fits with the other dependencies'.format(self.name, self.vrange)
+
+
+def resolve(requirements, index, mx=VERSION_MAX):
+	"""
+	Resolve requirements against an index in one go; see `Resolver` for details.
+	"""
+	return Resolver(index, mx=mx).resolve(requirements)
+
+
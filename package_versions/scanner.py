@@ -0,0 +1,44 @@
+
+"""
+	Precompiled scanning of dependency lines, so each line is matched only once.
+
+	It accepts the lines that match PACKAGE_RANGE_PATTERN and have commas between selections,
+	which are the ones that `VersionRange` could parse after the pattern matched.
+"""
+
+from re import compile as re_compile
+from .settings import VersionFormatError, PACKAGE_NAME_PATTERN, PACKAGE_RANGE_PATTERN
+
+
+SELECTION_PATTERN = r'[<>=]=?(?:\*|\d{1,5})(?:\.(?:\*|\d{1,5})|\.|)'
+DEPENDENCY_REGEX = re_compile(r'^({0:s})({1:s}(?:,{1:s})*,?)$'.format(PACKAGE_NAME_PATTERN, SELECTION_PATTERN))
+SELECTION_TOKEN_REGEX = re_compile(r'([<>=]=?)(\*|\d{1,5})(?:\.(\*|\d{1,5}|))?,?')
+
+
+def scan_dependency(txt):
+	"""
+	Split a dependency line, like 'package>=1.3,<2', into name and selections.
+
+	:return: None for empty and comment lines, otherwise a tuple (name, selections).
+	"""
+	txt = txt.partition('#')[0].strip().lower()
+	if not txt:
+		return None
+	found = DEPENDENCY_REGEX.match(txt)
+	if not found:
+		raise VersionFormatError(('Given text "{0:s}" does not seem to be formatted correctly ' +
+			'(according to pattern "{1:s}")"').format(txt, PACKAGE_RANGE_PATTERN))
+	return found.groups()
+
+
+def iter_selection_tokens(selections):
+	"""
+	Split selections from a scanned dependency line into (operation, major, minor) strings.
+
+	These can be given to `VersionRange.apply_selection`. It is a generator, so nothing is done if
+	the selections are found in the cache by `VersionRange.from_tokens`.
+	"""
+	for token in SELECTION_TOKEN_REGEX.findall(selections):
+		yield token
+
+
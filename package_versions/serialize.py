@@ -0,0 +1,135 @@
+
+"""
+	Compact binary storage of dependency sets, which can be read without parsing everything.
+
+	The format is a header, then a fixed-size record per package (with the range bounds and the position
+	of its name), then all names as utf-8. All integers are little-endian.
+"""
+
+from collections import OrderedDict
+from mmap import mmap, ACCESS_READ
+from struct import Struct
+from .versions import VersionRange
+
+try:
+	from collections.abc import Mapping
+except ImportError:
+	from collections import Mapping
+
+
+MAGIC = b'PVDS'
+FORMAT_VERSION = 1
+HEADER = Struct('<4sHHI')
+RECORD = Struct('<qqIIIB3x')
+
+
+class SerializationError(Exception):
+	""" Data is not in the binary dependency format, or in an unsupported version of it. """
+
+
+def dumps_dependencies(dependencies):
+	"""
+	:param dependencies: Mapping from package names to ranges, like from `parse_dependencies`.
+	:return: The binary representation as bytes.
+	"""
+	names = bytearray()
+	records = bytearray()
+	for name, vrange in dependencies.items():
+		encoded = name.encode('utf-8')
+		records.extend(RECORD.pack(vrange.min, vrange.max, len(names), len(encoded), vrange.limit, int(vrange.prefer_highest)))
+		names.extend(encoded)
+	return HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(dependencies)) + bytes(records) + bytes(names)
+
+
+def dump_dependencies(dependencies, target):
+	"""
+	:param target: Path or binary file-like object to write to.
+	"""
+	data = dumps_dependencies(dependencies)
+	if hasattr(target, 'write'):
+		target.write(data)
+	else:
+		with open(target, 'wb') as fh:
+			fh.write(data)
+
+
+class DependencyView(Mapping):
+	"""
+	Read-only mapping from package names to ranges, backed by binary data (see `dumps_dependencies`).
+
+	Records are only decoded when accessed, and `VersionRange` objects are created on each access.
+	"""
+	def __init__(self, data, closer=None):
+		self.data = memoryview(data)
+		self.closer = closer
+		if len(self.data) < HEADER.size:
+			raise SerializationError('data is too short for a header')
+		magic, version, reserved, self.count = HEADER.unpack_from(self.data, 0)
+		if magic != MAGIC:
+			raise SerializationError('data does not start with {0:}'.format(MAGIC))
+		if version != FORMAT_VERSION:
+			raise SerializationError('format version {0:d} is not supported'.format(version))
+		self.names_start = HEADER.size + self.count * RECORD.size
+		if len(self.data) < self.names_start:
+			raise SerializationError('data is too short for {0:d} records'.format(self.count))
+		self.positions = None
+
+	def _record(self, index):
+		return RECORD.unpack_from(self.data, HEADER.size + index * RECORD.size)
+
+	def name_at(self, index):
+		min, max, offset, length, limit, prefer_highest = self._record(index)
+		start = self.names_start + offset
+		return bytes(self.data[start:start + length]).decode('utf-8')
+
+	def range_at(self, index):
+		min, max, offset, length, limit, prefer_highest = self._record(index)
+		return VersionRange.from_bounds(min, max, bool(prefer_highest), mx=limit)
+
+	def __len__(self):
+		return self.count
+
+	def __iter__(self):
+		for index in range(self.count):
+			yield self.name_at(index)
+
+	def __getitem__(self, name):
+		if self.positions is None:
+			self.positions = dict((name, index) for index, name in enumerate(self))
+		return self.range_at(self.positions[name])
+
+	def to_dict(self):
+		""" All dependencies as an OrderedDict, like `parse_dependencies` returns. """
+		return OrderedDict((self.name_at(index), self.range_at(index)) for index in range(self.count))
+
+	def close(self):
+		self.data.release()
+		if self.closer is not None:
+			self.closer()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+
+def loads_dependencies(data):
+	"""
+	:param data: Bytes or other buffer with the binary representation.
+	:return: DependencyView over the data, without copying it.
+	"""
+	return DependencyView(data)
+
+
+def load_dependencies(path, use_mmap=True):
+	"""
+	Open a binary dependency file, memory-mapped by default. Close the result (or use `with`) when done.
+	"""
+	with open(path, 'rb') as fh:
+		if not use_mmap:
+			return DependencyView(fh.read())
+		mapped = mmap(fh.fileno(), 0, access=ACCESS_READ)
+	return DependencyView(mapped, closer=mapped.close)
+
+
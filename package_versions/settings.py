@@ -10,20 +10,29 @@
 		then be represented as one combined integer. Since normal integers
 		are capped at 2147483647, a little below the sqrt seems reasonable.
 	* Don't change VERSION_MAX after going live, it'll change all versions!
+	* VERSION_WIDE_MAX is the limit for the alternative encoding of major, minor and patch
+		in one integer (see `to_nr3`); its cube still fits a signed 64-bit integer.
+	* The number of distinct selection strings whose parsed ranges are cached
+		is SELECTION_CACHE_SIZE; it can be changed at runtime with `selection_cache.resize`.
+		The same goes for INTERSECTION_CACHE_SIZE and `intersection_cache`.
 """
 
 
 VERSION_MAX = 46340
+VERSION_WIDE_MAX = 2097151
+
+SELECTION_CACHE_SIZE = 1024
+INTERSECTION_CACHE_SIZE = 4096
 
 PACKAGE_NAME_PATTERN = r'[a-z][a-z0-9_]{0,31}'
 PACKAGE_NAME_MESSAGE = 'Package names may contain up to 32 lowercase letters, numbers and underscores ' + \
 	'and must start with a letter.'
 
 VERSION_REST_PATTERN = r'[^.][a-zA-Z0-9_\-.]+'
-VERSION_PATTERN = '\d{1,5}(?:\.\d{1,5})?(?:\.' + VERSION_REST_PATTERN + ')?)?'
+VERSION_PATTERN = r'\d{1,5}(?:\.\d{1,5})?(?:\.' + VERSION_REST_PATTERN + ')?)?'
 VERSION_MESSAGE = 'Version numbers should be formatted like 1.0.dev7, the first two being under {0:d}'.format(VERSION_MAX - 2)
 
-VERSION_RANGE_PATTERN = '(?:[<>=\\z]=?(?:\*|\d{1,5})(?:\.(?:\*|\d{1,5})|\.|),?)+'
+VERSION_RANGE_PATTERN = r'(?:[<>=]=?(?:\*|\d{1,5})(?:\.(?:\*|\d{1,5})|\.|),?)+'
 PACKAGE_RANGE_PATTERN = r'({0:s})({1:s})'.format(PACKAGE_NAME_PATTERN, VERSION_RANGE_PATTERN)
 
 FILENAME_PATTERN = r'[a-zA-Z0-9_\-.]{1,32}'
@@ -0,0 +1,80 @@
+
+"""
+	Catalogs for many packages that can be read from many threads while releases are being added.
+"""
+
+from threading import Lock
+from .catalog import VersionCatalog
+from .settings import VersionRangeMismatch, VERSION_MAX
+
+try:
+	from types import MappingProxyType
+except ImportError:
+	MappingProxyType = dict
+
+
+class SnapshotCatalog(object):
+	"""
+	Versions per package, published as immutable snapshots.
+
+	Readers use the current snapshot without locking, so they never wait for writers and always see
+	a consistent state. Writers merge the new versions into copies of the sorted lists of the packages
+	they change (see `VersionCatalog.with_versions`), under a lock so concurrent writers don't lose updates,
+	and then replace the snapshot in one assignment. Batch many releases into one `update` call, since each
+	call copies the mapping of packages. Snapshots are read-only mappings where `types.MappingProxyType` exists.
+	"""
+	def __init__(self, releases=None, mx=VERSION_MAX):
+		"""
+		:param releases: Mapping or iterable of pairs from package names to iterables of versions.
+		"""
+		self.limit = mx
+		self.write_lock = Lock()
+		self.generation = 0
+		self.current = MappingProxyType({})
+		if releases:
+			self.update(releases)
+
+	def snapshot(self):
+		"""
+		Read-only mapping from package names to VersionCatalogs, which does not change when releases are added.
+		"""
+		return self.current
+
+	def catalog(self, name):
+		catalog = self.current.get(name)
+		if catalog is None:
+			raise VersionRangeMismatch('Package "{0:s}" is not in the catalog'.format(name))
+		return catalog
+
+	def choose(self, name, vrange, conflict='silent'):
+		return vrange.choose(self.catalog(name), conflict=conflict)
+
+	def update(self, releases):
+		"""
+		Add versions for any number of packages and publish them as one new snapshot.
+
+		:param releases: Mapping or iterable of pairs from package names to iterables of versions.
+		"""
+		if hasattr(releases, 'items'):
+			releases = releases.items()
+		with self.write_lock:
+			packages = dict(self.current)
+			for name, versions in releases:
+				old = packages.get(name)
+				packages[name] = old.with_versions(versions) if old else VersionCatalog(versions, mx=self.limit)
+			self.current = MappingProxyType(packages)
+			self.generation += 1
+
+	def add_versions(self, name, versions):
+		self.update(((name, versions),))
+
+	def __len__(self):
+		return len(self.current)
+
+	def __contains__(self, name):
+		return name in self.current
+
+	def __repr__(self):
+		return '{0:s}({1:d} packages, generation {2:d})'.format(self.__class__.__name__, len(self), self.generation)
+
+
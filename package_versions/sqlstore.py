@@ -0,0 +1,148 @@
+
+"""
+	Catalog of versions in an SQLite database, for catalogs that are too big to keep in memory.
+
+	Versions are stored with their encoded number (see `str2nrrest`), so that choosing a version for a range
+	is done with indexed range queries.
+"""
+
+from sqlite3 import connect
+from .convert import str2nrrest, version_sort_key
+from .settings import VersionRangeMismatch, VERSION_MAX
+from .conflicts import ConflictEvent, check_conflict_mode, version_problem_notify
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS settings (
+	key TEXT PRIMARY KEY,
+	value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS versions (
+	seq INTEGER PRIMARY KEY,
+	package TEXT NOT NULL,
+	nr INTEGER NOT NULL,
+	rest TEXT NOT NULL,
+	version TEXT NOT NULL,
+	UNIQUE (package, version)
+);
+CREATE INDEX IF NOT EXISTS versions_package_nr ON versions (package, nr, seq);
+'''
+
+
+class SQLiteCatalog(object):
+	"""
+	Available versions for many packages, stored in SQLite.
+
+	`choose` gives the same results as `VersionRange.choose` with the versions of that package
+	(in the order they were added), but only looks at the index rows it needs. The number is found with SQL,
+	and versions with that number are compared by their rest in Python.
+	"""
+	def __init__(self, path=':memory:', mx=VERSION_MAX):
+		"""
+		:param path: Database file, which is created if needed.
+		:param mx: Limit for the version encoding; a database can only be used with the limit it was created with.
+		"""
+		self.limit = mx
+		self.connection = connect(path)
+		with self.connection:
+			self.connection.executescript(SCHEMA)
+			self.connection.execute('INSERT OR IGNORE INTO settings (key, value) VALUES (?, ?)', ('limit', mx))
+		stored = self.connection.execute('SELECT value FROM settings WHERE key = ?', ('limit',)).fetchone()[0]
+		if stored != mx:
+			raise ValueError('database uses version limit {0:d}, not {1:d}'.format(stored, mx))
+
+	@property
+	def highest_nr(self):
+		return (self.limit + 1) * self.limit
+
+	def _rows(self, releases):
+		for package, versions in releases:
+			for version in versions:
+				nr, rest = str2nrrest(version, mx=self.limit)
+				yield package, nr, rest, version
+
+	def import_releases(self, releases, batch_size=10000):
+		"""
+		Add versions for many packages, committing in batches. Versions that are already present are skipped.
+
+		:param releases: Mapping or iterable of pairs from package names to iterables of versions.
+		"""
+		if hasattr(releases, 'items'):
+			releases = releases.items()
+		batch = []
+		for row in self._rows(releases):
+			batch.append(row)
+			if len(batch) >= batch_size:
+				self._insert(batch)
+				batch = []
+		if batch:
+			self._insert(batch)
+
+	def add_versions(self, package, versions, batch_size=10000):
+		self.import_releases(((package, versions),), batch_size=batch_size)
+
+	def _insert(self, rows):
+		with self.connection:
+			self.connection.executemany('INSERT OR IGNORE INTO versions (package, nr, rest, version) VALUES (?, ?, ?, ?)', rows)
+
+	def packages(self):
+		return [row[0] for row in self.connection.execute('SELECT DISTINCT package FROM versions ORDER BY package')]
+
+	def versions(self, package):
+		"""
+		The versions of the package, in the order they were added.
+		"""
+		return [row[0] for row in self.connection.execute('SELECT version FROM versions WHERE package = ? ORDER BY seq', (package,))]
+
+	def _first(self, query, *args):
+		row = self.connection.execute(query, args).fetchone()
+		return None if row is None else row[0]
+
+	def _pick(self, package, nr, highest):
+		"""
+		The highest (last if equal) or lowest (first if equal) version of the package with this number.
+		"""
+		if nr is None:
+			return None
+		versions = self.connection.execute('SELECT version FROM versions WHERE package = ? AND nr = ? ORDER BY seq',
+			(package, nr)).fetchall()
+		key = lambda row: version_sort_key(row[0], mx=self.limit)
+		if highest:
+			return max(reversed(versions), key=key)[0]
+		return min(versions, key=key)[0]
+
+	def highest_in(self, package, min, max):
+		return self._pick(package, self._first('SELECT MAX(nr) FROM versions WHERE package = ? AND nr BETWEEN ? AND ?',
+			package, min, max), highest=True)
+
+	def lowest_above(self, package, max):
+		return self._pick(package, self._first('SELECT MIN(nr) FROM versions WHERE package = ? AND nr > ? AND nr < ?',
+			package, max, self.highest_nr), highest=False)
+
+	def highest(self, package):
+		return self._pick(package, self._first('SELECT MAX(nr) FROM versions WHERE package = ? AND nr > 0',
+			package), highest=True)
+
+	def choose(self, package, vrange, conflict='silent'):
+		"""
+		Choose the version of the package for the range, like `VersionRange.choose`.
+		"""
+		check_conflict_mode(conflict)
+		assert vrange.limit == self.limit
+		if self._first('SELECT 1 FROM versions WHERE package = ? LIMIT 1', package) is None:
+			raise VersionRangeMismatch('No versions to choose from')
+		top_version = self.highest_in(package, vrange.min, vrange.max)
+		if top_version:
+			return top_version
+		if conflict != 'silent':
+			version_problem_notify(ConflictEvent('no_match', package=package, ranges=(vrange,), options=self.versions(package),
+				mx=self.limit), conflict=conflict)
+		top_version = self.lowest_above(package, vrange.max)
+		if top_version:
+			return top_version
+		return self.highest(package)
+
+	def close(self):
+		self.connection.close()
+
+
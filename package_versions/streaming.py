@@ -0,0 +1,56 @@
+
+"""
+	Read dependencies from files one line at a time, without loading the whole file.
+"""
+
+from mmap import mmap, ACCESS_READ
+from os import fstat
+from .versions import parse_dependency, merge_dependencies
+
+
+def iter_lines(source, use_mmap=False, encoding='utf-8'):
+	"""
+	Generate the lines of a file-like object or of the file at a path.
+
+	:param use_mmap: Memory-map the file instead of reading it in buffered chunks (only for paths).
+	"""
+	if hasattr(source, 'read'):
+		for line in source:
+			yield line.decode(encoding) if isinstance(line, bytes) else line
+	elif use_mmap:
+		with open(source, 'rb') as fh:
+			if fstat(fh.fileno()).st_size == 0:
+				return
+			mapped = mmap(fh.fileno(), 0, access=ACCESS_READ)
+			try:
+				for line in iter(mapped.readline, b''):
+					yield line.decode(encoding)
+			finally:
+				mapped.close()
+	else:
+		with open(source, 'r', encoding=encoding) as fh:
+			for line in fh:
+				yield line
+
+
+def iter_dependencies(source, use_mmap=False, encoding='utf-8'):
+	"""
+	Generate (name, VersionRange) for each dependency line in a file-like object or path.
+
+	Empty and comment lines are skipped; duplicate names are yielded as they are.
+	"""
+	for line in iter_lines(source, use_mmap=use_mmap, encoding=encoding):
+		result = parse_dependency(line)
+		if result:
+			yield result
+
+
+def read_dependencies(source, duplicates='silent', use_mmap=False, encoding='utf-8'):
+	"""
+	Like `parse_dependencies`, but streams from a file-like object or path.
+
+	Duplicates are merged while reading, so memory use depends on the number of distinct packages.
+	"""
+	return merge_dependencies(iter_dependencies(source, use_mmap=use_mmap, encoding=encoding), duplicates=duplicates)
+
+
@@ -0,0 +1,60 @@
+
+import asyncio
+from pytest import raises
+from .aio import VersionProvider, StaticProvider, AsyncResolver
+from .settings import VersionRangeMismatch
+from .versions import VersionRange
+
+
+class SlowProvider(VersionProvider):
+	""" Provider that waits before answering and records how many queries run at once. """
+	def __init__(self, versions, delay, timeout=None):
+		self.known = versions
+		self.delay = delay
+		self.timeout = timeout
+		self.calls = []
+		self.active = self.max_active = 0
+
+	async def versions(self, name):
+		self.calls.append(name)
+		self.active += 1
+		self.max_active = max(self.max_active, self.active)
+		try:
+			await asyncio.sleep(self.delay)
+		finally:
+			self.active -= 1
+		return self.known.get(name, ())
+
+
+def test_resolve_dependencies():
+	first = SlowProvider({'pack1': ['1.0', '2.0'], 'pack2': ['1.5']}, delay=0.01)
+	second = StaticProvider({'pack2': ['1.8', '3.0'], 'pack3': ['0.1']})
+	resolver = AsyncResolver([first, second], concurrency=2)
+	result = asyncio.run(resolver.resolve_dependencies('pack1<2\npack2>=1.5,<3\npack3==*'))
+	assert list(result.items()) == [('pack1', '1.0'), ('pack2', '1.8'), ('pack3', '0.1')]
+	assert first.max_active <= 2
+
+
+def test_cached_lookups():
+	provider = SlowProvider({'pack': ['1.0', '2.0']}, delay=0.01)
+	resolver = AsyncResolver([provider])
+	async def run():
+		return await asyncio.gather(*(resolver.choose('pack', VersionRange('<2')) for k in range(5)))
+	assert asyncio.run(run()) == ['1.0'] * 5
+	assert asyncio.run(resolver.choose('pack', VersionRange('>=2'))) == '2.0'
+	assert provider.calls == ['pack']
+
+
+def test_provider_timeout():
+	slow = SlowProvider({'pack': ['9.0']}, delay=5, timeout=0.01)
+	fast = StaticProvider({'pack': ['1.0']})
+	resolver = AsyncResolver([slow, fast], timeout=10)
+	assert asyncio.run(resolver.choose('pack', VersionRange('==*'))) == '1.0'
+
+
+def test_unknown_package():
+	resolver = AsyncResolver([StaticProvider({})])
+	with raises(VersionRangeMismatch):
+		asyncio.run(resolver.choose('missing', VersionRange('==*')))
+
+
@@ -0,0 +1,70 @@
+
+from pytest import fixture, skip, raises
+from . import batch
+from .batch import encode_versions, contains_each, contains_mask, choose_batch, choose_all
+from .conflicts import ConflictCollector
+from .convert import str2nr, str2nr3
+from .settings import VersionRangeMismatch
+from .versions import VersionRange, parse_dependencies
+
+
+OPTIONS = ['0.0.0', '2.8.', '2.1.unordered', '1.0.dev1', '2.2.words', '2.9.9', '999.999.0']
+SELECTIONS = ['>=2.2,<2.9', '>=2.2,<=2.9', '>2.2,<2.7', '>2.2', '<2.9', '<=2.9', '>2.9,<7.0', '==1.*', '==0.*']
+
+
+@fixture(params=['numpy', 'python'])
+def backend(request, monkeypatch):
+	if request.param == 'numpy':
+		if batch.numpy is None:
+			skip('numpy not installed')
+	else:
+		monkeypatch.setattr(batch, 'numpy', None)
+	return request.param
+
+
+def test_encode_versions(backend):
+	assert list(encode_versions(OPTIONS)) == [str2nr(version) for version in OPTIONS]
+
+
+def test_encode_versions_wide(backend):
+	numbers = list(encode_versions(OPTIONS, wide=True))
+	assert numbers == [str2nr3(version) for version in OPTIONS]
+	assert encode_versions(['2.9.10'], wide=True)[0] > encode_versions(['2.9.9'], wide=True)[0]
+
+
+def test_contains_each(backend):
+	ranges = [VersionRange(selection) for selection in SELECTIONS]
+	versions = ['2.8', '2.9', '2.7', '2.3', '2.9', '2.9', '5.0', '2.0', '0.5']
+	found = contains_each(ranges, encode_versions(versions))
+	assert [bool(val) for val in found] == [version in vrange for vrange, version in zip(ranges, versions)]
+
+
+def test_contains_mask(backend):
+	ranges = [VersionRange(selection) for selection in SELECTIONS]
+	mask = contains_mask(ranges, encode_versions(OPTIONS))
+	for k, vrange in enumerate(ranges):
+		assert [bool(val) for val in mask[k]] == [version in vrange for version in OPTIONS]
+	wide_mask = contains_mask(ranges, encode_versions(OPTIONS, wide=True), wide=True)
+	assert [[bool(val) for val in row] for row in wide_mask] == [[bool(val) for val in row] for row in mask]
+
+
+def test_choose_batch(backend):
+	ranges = [VersionRange(selection) for selection in SELECTIONS]
+	assert choose_batch(ranges, OPTIONS) == [vrange.choose(OPTIONS) for vrange in ranges]
+	assert choose_batch(ranges, OPTIONS[:-1]) == [vrange.choose(OPTIONS[:-1]) for vrange in ranges]
+	assert choose_batch([], OPTIONS) == []
+
+
+def test_choose_all():
+	dependencies = parse_dependencies('\n'.join('pack{0:d}{1:s}'.format(k, selection) for k, selection in enumerate(SELECTIONS)))
+	for options in (OPTIONS, OPTIONS[:-1], ['1.2.a', '1.2.b', '2.9.9', '2.9.10', '2.9.1']):
+		chosen = choose_all(dependencies, options)
+		assert list(chosen.keys()) == list(dependencies.keys())
+		assert list(chosen.values()) == [vrange.choose(options) for vrange in dependencies.values()]
+	collector = ConflictCollector()
+	choose_all(dependencies, OPTIONS, conflict=collector)
+	assert len(collector) == sum(1 for vrange in dependencies.values() if vrange.choose(OPTIONS) not in vrange)
+	with raises(VersionRangeMismatch):
+		choose_all(dependencies, [])
+
+
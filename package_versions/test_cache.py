@@ -0,0 +1,49 @@
+
+from pytest import raises
+from .cache import LRUCache
+from .versions import VersionRange, selection_cache
+from .settings import VersionRangeMismatch, VersionFormatError
+
+
+def test_lru_eviction():
+	cache = LRUCache(maxsize=2)
+	cache.put('a', 1)
+	cache.put('b', 2)
+	assert cache.get('a') == 1
+	cache.put('c', 3)
+	assert 'a' in cache and 'c' in cache and 'b' not in cache
+	assert cache.get('b') is None
+	assert cache.info() == (1, 1, 2, 2)
+	cache.resize(1)
+	assert len(cache) == 1 and 'c' in cache
+	cache.resize(0)
+	cache.put('d', 4)
+	assert len(cache) == 0
+
+
+def test_selection_cache_hits():
+	selection_cache.clear()
+	first = VersionRange('>=1.3,<2.0')
+	assert selection_cache.info().misses == 1
+	second = VersionRange('>=1.3,<2.0')
+	assert selection_cache.info().hits == 1
+	assert first == second and first is not second
+	assert VersionRange('>=1.3,<2.0', mx=100) == VersionRange.raw(min=(1, 3), max=(2, 0), max_inclusive=False, mx=100)
+	assert str(VersionRange('>=2.3_')) == str(VersionRange('>=2.3_')) == '>=2.3_'
+
+
+def test_selection_cache_not_shared():
+	""" Instances from the cache should be independent. """
+	first = VersionRange('>=1.3')
+	first.add_selection('<1.5')
+	assert VersionRange('>=1.3') == VersionRange.raw(min=(1, 3))
+
+
+def test_selection_cache_errors():
+	for k in range(2):
+		with raises(VersionFormatError):
+			VersionRange('hello world')
+		with raises(VersionRangeMismatch):
+			VersionRange('>2.3,<=2.2')
+
+
@@ -0,0 +1,81 @@
+
+from pytest import raises
+from .catalog import VersionCatalog
+from .versions import VersionRange
+from .settings import VersionRangeMismatch
+
+
+OPTIONS = ['0.0.0', '2.8.', '2.1.unordered', '1.0.dev1', '2.2.words', '2.9.9', '999.999.0']
+
+
+def test_catalog_sorted():
+	catalog = VersionCatalog(OPTIONS + ['2.8.'])
+	assert len(catalog) == len(OPTIONS)
+	assert catalog.numbers == sorted(catalog.numbers)
+	assert list(catalog) == OPTIONS
+	assert '2.9.9' in catalog
+
+
+def test_catalog_lookups():
+	catalog = VersionCatalog(OPTIONS)
+	vr = VersionRange('>=2.2,<2.9')
+	assert catalog.highest_in(vr.min, vr.max) == '2.8.'
+	assert catalog.lowest_above(vr.max) == '2.9.9'
+	assert catalog.highest() == '999.999.0'
+	assert VersionCatalog(['0.0', '0.0.1']).highest() is None
+
+
+def test_catalog_choose_same_as_list():
+	catalog = VersionCatalog(OPTIONS)
+	for selection in ('>=2.2,<2.9', '>=2.2,<=2.9', '>2.2,<2.7', '>2.2', '<2.9', '<=2.9', '>2.9,<7.0', '>10,<20', '==1.*'):
+		vr = VersionRange(selection)
+		assert vr.choose(catalog) == vr.choose(OPTIONS) == catalog.choose(vr)
+	assert VersionRange('>10,<20').choose(VersionCatalog(OPTIONS[:-1])) == '2.9.9'
+
+
+def test_catalog_ties():
+	""" Equal major/minor are ordered by the rest: highest in range or overall, lowest above the range. """
+	for options in (['1.2.a', '1.2.b', '3.0.a', '3.0.b'], ['1.2.b', '1.2.a', '3.0.b', '3.0.a']):
+		assert VersionRange('<2').choose(VersionCatalog(options)) == '1.2.b'
+		assert VersionRange('>=2').choose(VersionCatalog(options)) == '3.0.b'
+		assert VersionRange('<1').choose(VersionCatalog(options)) == '1.2.a'
+		assert VersionRange('>5').choose(VersionCatalog(options)) == '3.0.b'
+		for selection in ('<2', '>=2', '<1', '>5', '==1.2', '>1.2,<3'):
+			assert VersionRange(selection).choose(options) == VersionRange(selection).choose(VersionCatalog(options))
+	assert VersionRange('==2.9').choose(['2.9.9', '2.9.10', '2.9.1']) == '2.9.10'
+
+
+def test_catalog_with_versions():
+	catalog = VersionCatalog(OPTIONS)
+	extended = catalog.with_versions(['2.9.10', '2.8.', '2.9.1', '0.5'])
+	reference = VersionCatalog(OPTIONS + ['2.9.10', '2.9.1', '0.5'])
+	assert (extended.versions, extended.numbers, extended.ordered) == (reference.versions, reference.numbers, reference.ordered)
+	assert list(catalog) == OPTIONS
+	assert catalog.with_versions(['2.8.']) is catalog
+
+
+def test_catalog_empty():
+	with raises(VersionRangeMismatch):
+		VersionRange('==*').choose(VersionCatalog())
+
+
+def test_rank():
+	catalog = VersionCatalog(OPTIONS + ['2.8.1', '2.9.0'])
+	vrange = VersionRange('>=2.2,<2.9')
+	assert list(catalog.rank(vrange)) == ['2.8.1', '2.8.', '2.2.words', '2.9.0', '2.9.9', '999.999.0', '2.1.unordered', '1.0.dev1']
+	assert vrange.choose_many(catalog, 3) == ['2.8.1', '2.8.', '2.2.words']
+	assert list(vrange.rank(OPTIONS)) == list(VersionCatalog(OPTIONS).rank(vrange))
+	for selection in ('>=2.2,<2.9', '>2.2', '<2.9', '>2.9,<7.0', '>1000', '==1.*', '==0.*'):
+		vr = VersionRange(selection)
+		assert vr.choose_many(OPTIONS, 1) == [vr.choose(OPTIONS)]
+		assert vr.choose_many(OPTIONS[:-1], 1) == [vr.choose(OPTIONS[:-1])]
+
+
+def test_choose_many_conflict():
+	with raises(VersionRangeMismatch):
+		VersionRange('>1000').choose_many(OPTIONS, 2, conflict='error')
+	with raises(VersionRangeMismatch):
+		VersionRange('==*').choose_many([], 2)
+	assert VersionRange('==*').choose_many(['0.0'], 2) == ['0.0']
+
+
@@ -0,0 +1,60 @@
+
+from json import dumps, loads
+from .cli import main, find_files
+
+
+def write_tree(tmp_path):
+	addons = tmp_path / 'addons'
+	(addons / 'sub').mkdir(parents=True)
+	(addons / 'one.txt').write_text('pack1>1.7\npack2>1.3,<6\n')
+	(addons / 'sub' / 'two.txt').write_text('pack2<5\npack3==2.*\n')
+	(addons / 'sub' / 'skipped.md').write_text('not a requirements file')
+	(tmp_path / 'broken.txt').write_text('pack1>>1\n')
+	catalog = tmp_path / 'catalog.json'
+	catalog.write_text(dumps({'pack1': ['1.0', '2.0', '3.0'], 'pack2': ['4.9', '5.0'], 'pack3': ['2.1', '3.0']}))
+	return addons, catalog
+
+
+def test_find_files(tmp_path):
+	addons, catalog = write_tree(tmp_path)
+	assert [path[len(str(addons)):] for path in find_files([str(addons)])] == ['/one.txt', '/sub/two.txt']
+
+
+def test_cli(tmp_path):
+	addons, catalog = write_tree(tmp_path)
+	for workers in ('1', '2'):
+		output = tmp_path / 'out{0:s}.jsonl'.format(workers)
+		status = main([str(addons), '--catalog', str(catalog), '--output', str(output), '--workers', workers, '--chunksize', '1'])
+		assert status == 0
+		lines = [loads(line) for line in output.read_text().splitlines()]
+		assert lines == [
+			{'package': 'pack1', 'range': '>=1.8', 'version': '3.0', 'in_range': True},
+			{'package': 'pack2', 'range': '>=1.4,<5.0', 'version': '4.9', 'in_range': True},
+			{'package': 'pack3', 'range': '>=2.0,<3.0', 'version': '2.1', 'in_range': True},
+		]
+
+
+def test_cli_errors(tmp_path, capsys):
+	addons, catalog = write_tree(tmp_path)
+	status = main([str(tmp_path / 'broken.txt'), str(addons / 'one.txt'), '--workers', '1', '--timing'])
+	assert status == 1
+	out, err = capsys.readouterr()
+	lines = [loads(line) for line in out.splitlines()]
+	assert lines[0]['file'].endswith('broken.txt') and 'error' in lines[0]
+	assert [line['package'] for line in lines[1:]] == ['pack1', 'pack2']
+	assert '2 files, 2 packages' in err
+
+
+def test_cli_conflicts(tmp_path, capsys):
+	addons, catalog = write_tree(tmp_path)
+	(addons / 'three.txt').write_text('pack1>=7\npack3>=7\n')
+	status = main([str(addons), '--catalog', str(catalog), '--workers', '1', '--conflict', 'silent'])
+	assert status == 1
+	lines = [loads(line) for line in capsys.readouterr()[0].splitlines()]
+	assert lines[0] == {'package': 'pack1', 'range': '>=7.0', 'version': '3.0', 'in_range': False}
+	status = main([str(addons), '--catalog', str(catalog), '--workers', '1', '--conflict', 'error'])
+	assert status == 1
+	lines = [loads(line) for line in capsys.readouterr()[0].splitlines()]
+	assert [sorted(line) for line in lines] == [['error', 'package'], ['in_range', 'package', 'range', 'version'], ['error', 'package']]
+	assert 'No matching version' in lines[0]['error'] and 'do not overlap' in lines[2]['error']
+
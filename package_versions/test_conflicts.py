@@ -0,0 +1,58 @@
+
+from pytest import raises
+from .conflicts import ConflictEvent, ConflictCollector
+from .merge import intersect_all, merge_dependency_sets
+from .settings import VersionRangeMismatch
+from .versions import VersionRange, parse_dependencies
+
+
+def test_collect_update_values():
+	collector = ConflictCollector()
+	vrange = VersionRange('<=2.5')
+	vrange.add_selection('>=3.0', conflict=collector)
+	assert len(collector) == 1
+	event = collector.events[0]
+	assert event.kind == 'min_conflict'
+	assert event.bounds == (vrange.to_nr(3, 0), vrange.to_nr(2, 5))
+	assert event.message.startswith('Minimum 3.0 conflicts with maximum 2.5;')
+
+
+def test_collect_choose_and_duplicates():
+	collector = ConflictCollector()
+	vrange = VersionRange('>5')
+	assert vrange.choose(['1.0', '2.0'], conflict=collector) == '2.0'
+	parse_dependencies('pack<=2.5\nother>1\npack>2', duplicates=collector)
+	assert [event.kind for event in collector] == ['no_match', 'duplicate']
+	assert collector.events[0].ranges == (vrange,)
+	assert collector.events[1].package == 'pack'
+	assert str(collector.events[1]) == 'Package with name "pack" appeared twice: "<=2.5" and ">=3.0"'
+	collector.clear()
+	assert len(collector) == 0
+
+
+def test_collect_merge():
+	collector = ConflictCollector()
+	intersect_all([VersionRange('<2'), VersionRange('>3')], conflict=collector)
+	merge_dependency_sets([{'pack': VersionRange('<2')}, {'pack': VersionRange('>3')}], conflict=collector)
+	assert [event.kind for event in collector] == ['no_overlap', 'package_no_overlap']
+	assert 'do not overlap' in collector.events[0].message
+	assert collector.events[1].message.endswith('using "{0:s}".'.format(collector.events[1].result))
+
+
+def test_error_has_event():
+	with raises(VersionRangeMismatch) as info:
+		VersionRange('<2').intersection(VersionRange('>3'), conflict='error')
+	assert isinstance(info.value.args[0], ConflictEvent)
+	assert info.value.args[0].kind == 'min_conflict'
+	assert str(info.value).startswith('Minimum 4.0 conflicts')
+
+
+def test_silent_builds_no_events(monkeypatch):
+	def fail(*args, **kwargs):
+		raise AssertionError('event created in silent mode')
+	monkeypatch.setattr(ConflictEvent, '__init__', fail)
+	assert VersionRange('<2') & VersionRange('>3') == VersionRange('<2').intersection(VersionRange('>3'), conflict='silent')
+	VersionRange('>5').choose(['1.0'])
+	parse_dependencies('pack<3\npack>2')
+
+
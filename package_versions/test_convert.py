@@ -1,6 +1,7 @@
 
 from pytest import raises
-from .convert import str2nrrest, nrrest2str, str2nr, nr2str, VersionTooHigh, VERSION_MAX
+from .convert import str2nrrest, nrrest2str, str2nr, nr2str, rest_key, version_sort_key, sort_versions, max_version, \
+	str2nr3rest, str2nr3, nr3rest2str, to_nr3, to_tup3, VersionTooHigh, VERSION_MAX, VERSION_WIDE_MAX
 
 
 def test_conversion():
@@ -43,3 +44,40 @@ def test_max():
 	pass
 
 
+def test_sort_versions():
+	versions = ['2.9.10', '1.0', '2.9.9', '2.9.dev', '2.9', '10.0', '2.9.9.1', '2.9.1']
+	assert sort_versions(versions) == ['1.0', '2.9.dev', '2.9', '2.9.1', '2.9.9', '2.9.9.1', '2.9.10', '10.0']
+	assert sort_versions(versions, reverse=True)[0] == max_version(versions) == '10.0'
+	assert max_version(['2.9.1', '2.9.9', '2.9.2']) == '2.9.9'
+	assert version_sort_key('2.9.9') < version_sort_key('2.9.10')
+	assert rest_key('dev1') < rest_key('a1') < rest_key('beta2') < rest_key('rc1') < rest_key('') < rest_key('post1') < rest_key('0')
+	assert sort_versions(['2.9.9', '2.9.9rc1', '2.9.9.post1', '2.9.9rc1.dev2']) == ['2.9.9rc1.dev2', '2.9.9rc1', '2.9.9', '2.9.9.post1']
+
+
+def test_three_part_round_trip():
+	test_range = [0, 1, 2, 3, 11, 87]
+	for major in test_range:
+		for minor in test_range:
+			for patch in test_range:
+				for rest in ['', '123', 'dev', 'rc1.post2']:
+					for mx in [100, VERSION_WIDE_MAX]:
+						txt = '{0:d}.{1:d}.{2:d}'.format(major, minor, patch) + ('.' + rest if rest else '')
+						nr, found_rest = str2nr3rest(txt, mx=mx)
+						assert nr3rest2str(nr, found_rest, mx=mx) == txt
+						assert to_tup3(nr, mx=mx) == (major, minor, patch)
+	for txt, normalized in (('1.0.dev1', '1.0.0.dev1'), ('2.9.10rc1', '2.9.10.rc1'), ('3', '3.0.0'), ('2.8.', '2.8.0')):
+		assert nr3rest2str(*str2nr3rest(txt)) == normalized
+		assert str2nr3rest(normalized) == str2nr3rest(txt)
+
+
+def test_three_part_conversion():
+	assert str2nr3rest('2.9.10rc1') == (to_nr3(2, 9, 10), 'rc1')
+	assert str2nr3rest('1.0.dev1') == (to_nr3(1, 0, 0), 'dev1')
+	assert nr3rest2str(*str2nr3rest('2.9.9.1')) == '2.9.9.1'
+	assert to_tup3(str2nr3('3')) == (3, 0, 0)
+	assert str2nr3('2.9.9') < str2nr3('2.9.10') < str2nr3('2.10.0')
+	assert to_nr3(VERSION_WIDE_MAX, VERSION_WIDE_MAX, VERSION_WIDE_MAX) < 2 ** 63
+	with raises(VersionTooHigh):
+		str2nr3('1.0.100', mx=100)
+
+
@@ -0,0 +1,52 @@
+
+from pytest import raises
+from .incremental import IncrementalParser
+from .versions import parse_dependencies
+from .settings import VersionRangeMismatch
+
+
+TEXT = 'PACK1>1.7\npack2>1.3,<6\ndup<=2.7\n#pack3==*\n\npack4<3.4#,>1.2\ndup>2.0#\n#'
+
+
+def test_same_as_full_parse():
+	parser = IncrementalParser(TEXT)
+	assert parser.dependencies == parse_dependencies(TEXT)
+	edits = (
+		TEXT.replace('pack2>1.3', 'pack2>1.4'),
+		TEXT.replace('dup>2.0', 'dup>2.5'),
+		'newpack==1.*\n' + TEXT,
+		TEXT.replace('PACK1>1.7\n', ''),
+		TEXT.replace('dup<=2.7\n', ''),
+		'',
+		TEXT,
+	)
+	for txt in edits:
+		result = parser.update(txt)
+		assert result == parse_dependencies(txt)
+		assert list(result.keys()) == list(parse_dependencies(txt).keys())
+	assert set(parser.line_cache) == set(TEXT.splitlines())
+
+
+def test_replace_lines():
+	parser = IncrementalParser(TEXT)
+	lines = TEXT.splitlines()
+	lines[1:2] = ['pack2<3', 'pack5>=1.0']
+	assert parser.replace(1, 2, ['pack2<3', 'pack5>=1.0']) == parse_dependencies('\n'.join(lines))
+
+
+def test_only_changed_names_merged():
+	parser = IncrementalParser(TEXT)
+	dup = parser.dependencies['dup']
+	pack2 = parser.dependencies['pack2']
+	parser.update(TEXT.replace('pack2>1.3', 'pack2>1.4'))
+	assert parser.dependencies['dup'] is dup
+	assert parser.dependencies['pack2'] is not pack2
+
+
+def test_duplicates_notified():
+	parser = IncrementalParser(TEXT.replace('dup>2.0', 'other>2.0'), duplicates='error')
+	parser.update(TEXT.replace('dup>2.0', 'other>2.0').replace('pack2>1.3', 'pack2>1.4'))
+	with raises(VersionRangeMismatch):
+		parser.update(TEXT)
+
+
@@ -0,0 +1,51 @@
+
+from random import Random
+from pytest import raises
+from .index import RangeIndex
+from .versions import VersionRange
+
+
+def test_containing():
+	index = RangeIndex([('a', VersionRange('>=1.3,<2')), ('b', VersionRange('==2.*')), ('c', VersionRange('>1.0'))])
+	assert index.containing('1.5') == ['c', 'a']
+	assert index.containing('2.0.1') == ['c', 'b']
+	assert index.containing('0.9') == []
+	assert index.overlapping(VersionRange('<=1.2')) == ['c']
+	assert index.overlapping(VersionRange('>=1.9,<2.1')) == ['c', 'a', 'b']
+
+
+def test_insert_remove():
+	index = RangeIndex({'a': VersionRange('<3'), 'b': VersionRange('>=2')})
+	assert len(index) == 2 and 'a' in index
+	index.insert('a', VersionRange('>=5'))
+	assert len(index) == 2
+	assert index.containing('2.5') == ['b']
+	index.remove('b')
+	assert index.containing('2.5') == []
+	assert index.containing('6.0') == ['a']
+	with raises(KeyError):
+		index.remove('b')
+
+
+def test_against_scan():
+	rnd = Random(42)
+	ranges = {}
+	index = RangeIndex(seed=1)
+	for step in range(2000):
+		owner = rnd.randint(0, 300)
+		if owner in ranges and rnd.random() < 0.3:
+			index.remove(owner)
+			del ranges[owner]
+			continue
+		low = rnd.randint(0, 40)
+		ranges[owner] = VersionRange('>={0:d}.{1:d},<={2:d}.{3:d}'.format(low, rnd.randint(0, 9), low + rnd.randint(1, 10), rnd.randint(0, 9)))
+		index.insert(owner, ranges[owner])
+		if step % 50 == 0:
+			version = '{0:d}.{1:d}'.format(rnd.randint(0, 55), rnd.randint(0, 9))
+			assert sorted(index.containing(version)) == sorted(owner for owner, vrange in ranges.items() if version in vrange)
+			query = VersionRange('>={0:d},<{1:d}'.format(low, low + 3))
+			assert sorted(index.overlapping(query)) == sorted(owner for owner, vrange in ranges.items()
+				if vrange.min <= query.max and vrange.max >= query.min)
+	assert len(index) == len(ranges)
+
+
@@ -0,0 +1,58 @@
+
+from pytest import fixture
+from .instrument import instrumentation
+from .versions import VersionRange, parse_dependencies, selection_cache
+
+
+@fixture
+def enabled():
+	instrumentation.reset()
+	instrumentation.enable()
+	yield instrumentation
+	instrumentation.disable()
+	instrumentation.reset()
+
+
+def test_disabled_by_default():
+	instrumentation.reset()
+	VersionRange('>=1.3,<2.0').choose(['1.4', '1.5'])
+	assert instrumentation.snapshot() == {'counts': {}, 'timings': {}}
+
+
+def test_range_and_conflicts(enabled):
+	selection_cache.clear()
+	VersionRange('>=1.3,<2.0')
+	VersionRange('>=1.3,<2.0')
+	VersionRange('>4.0,<5').add_selection('<3.0', conflict='silent')
+	counts = enabled.snapshot()['counts']
+	assert counts['range_cached'] == 1
+	assert counts['range_parse'] == 2
+	assert counts['conflict'] == 1
+	assert enabled.snapshot()['timings']['range_parse'] >= 0
+
+
+def test_choose_branches(enabled):
+	options = ['0.0.0', '2.8.', '2.9.9', '999.999.0']
+	VersionRange('>=2.2,<2.9').choose(options)
+	VersionRange('>2.2,<2.8').choose(options)
+	VersionRange('>1000').choose(options)
+	VersionRange('>1000').choose(['0.0'])
+	counts = enabled.snapshot()['counts']
+	assert [counts[event] for event in ('choose_in_range', 'choose_above', 'choose_highest', 'choose_none')] == [1, 1, 1, 1]
+
+
+def test_parse_dependencies_and_callbacks(enabled):
+	events = []
+	callback = lambda event, count, duration: events.append((event, count))
+	enabled.add_callback(callback)
+	try:
+		parse_dependencies('pack1>1.7\n\ndup<=2.7\n# comment\ndup>2.0')
+	finally:
+		enabled.remove_callback(callback)
+	counts = enabled.snapshot()['counts']
+	assert counts['dependency_lines'] == 5
+	assert counts['dependency_duplicates'] == 1
+	assert counts['parse_dependencies'] == 1
+	assert ('dependency_lines', 5) in events
+
+
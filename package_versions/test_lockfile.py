@@ -0,0 +1,72 @@
+
+from copy import deepcopy
+from json import load
+from .lockfile import LockFile, resolve_locked, dependencies_digest
+from .resolver import resolve
+from .test_resolver import INDEX, check
+from .versions import parse_dependencies
+
+
+def test_lock_reused(tmp_path):
+	path = str(tmp_path / 'deps.lock')
+	lock = LockFile(path, INDEX)
+	first = lock.resolve('app==1.*')
+	assert lock.stats['status'] == 'resolved'
+	assert first == resolve('app==1.*', INDEX)
+	assert lock.resolve('app==1.*') == first
+	assert lock.stats['status'] == 'locked'
+	with open(path) as fh:
+		assert load(fh)['versions'] == dict(first)
+
+
+def test_lock_validated(tmp_path):
+	path = str(tmp_path / 'deps.lock')
+	first = resolve_locked('app==1.*', INDEX, path)
+	lock = LockFile(path, INDEX)
+	assert dict(lock.resolve('app>=1.0,<1.5')) == dict(first)
+	assert lock.stats['status'] == 'validated'
+
+
+def test_lock_partial(tmp_path):
+	path = str(tmp_path / 'deps.lock')
+	first = resolve_locked('app==1.*', INDEX, path)
+	index = deepcopy(INDEX)
+	del index['util'][first['util']]
+	index['util']['2.5'] = None
+	lock = LockFile(path, index)
+	second = lock.resolve('app==1.*')
+	assert lock.stats['status'] == 'partial'
+	assert lock.stats['invalid'] == ['util']
+	assert [second[name] for name in ('app', 'web', 'db')] == [first[name] for name in ('app', 'web', 'db')]
+	assert second['util'] == '2.5'
+	check(second, index)
+
+
+def test_lock_changed_requirements(tmp_path):
+	path = str(tmp_path / 'deps.lock')
+	resolve_locked('app==1.*', INDEX, path)
+	lock = LockFile(path, INDEX)
+	second = lock.resolve('app>=2')
+	assert lock.stats['status'] == 'partial'
+	assert second == resolve('app>=2', INDEX)
+
+
+def test_lock_conflicting_ranges(tmp_path):
+	path = str(tmp_path / 'deps.lock')
+	index = deepcopy(INDEX)
+	index['web']['3.1'], index['db']['2.5'] = 'util>=2,<3', 'util>=2'
+	assert resolve_locked('web==3.1\ndb>=2,<3', index, path) == {'web': '3.1', 'db': '2.5', 'util': '2.0'}
+	index['web']['3.1'] = 'util<2'
+	lock = LockFile(path, index)
+	second = lock.resolve('web==3.1\ndb>=2,<3')
+	assert lock.stats['status'] == 'partial'
+	assert 'util' in lock.stats['invalid']
+	assert dict(second) == dict(resolve('web==3.1\ndb>=2,<3', index)) == {'web': '3.1', 'db': '2.0', 'util': '1.4'}
+	check(second, index)
+
+
+def test_digest_normalized():
+	assert dependencies_digest(parse_dependencies('a>1\nb<2')) == dependencies_digest(parse_dependencies('b<2.0\na>=2.0'))
+	assert dependencies_digest(parse_dependencies('a>1')) != dependencies_digest(parse_dependencies('a>2'))
+
+
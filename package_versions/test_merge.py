@@ -0,0 +1,46 @@
+
+from functools import reduce
+from pytest import raises
+from .merge import intersect_all, merge_dependency_sets
+from .settings import VersionRangeMismatch
+from .versions import VersionRange, parse_dependencies
+
+
+def test_intersect_all_overlapping():
+	selections = ['>=1.3', '<5', '==2.*,>=1.0', '>2.1']
+	ranges = [VersionRange(selection) for selection in selections]
+	assert intersect_all(ranges) == reduce(lambda first, second: first & second, ranges) == VersionRange('>2.1,<3')
+	assert intersect_all([]) == VersionRange('==*')
+	assert intersect_all([VersionRange('>=1.3_'), VersionRange('<2')]) == VersionRange('>=1.3,<2_')
+
+
+def test_intersect_all_conflict():
+	ranges = [VersionRange('>=2,<4'), VersionRange('>5.0,<=7.0')]
+	assert intersect_all(ranges, conflict='silent') == VersionRange('>5.0,<=7.0_')
+	assert intersect_all(ranges[::-1], conflict='silent') == VersionRange('>5.0,<=7.0_')
+	ranges = [VersionRange('==0.*'), VersionRange('<9.0'), VersionRange('>=4.0,<10.0')]
+	assert intersect_all(ranges, conflict='silent') == VersionRange('>=4.0,<9.0_')
+	with raises(VersionRangeMismatch):
+		intersect_all(ranges, conflict='error')
+
+
+def test_merge_dependency_sets():
+	sets = [
+		parse_dependencies('pack1>1.7\npack2>1.3,<6'),
+		parse_dependencies('pack2<5\npack3==2.*'),
+		parse_dependencies('pack1<=3\npack2>=2'),
+	]
+	merged = merge_dependency_sets(sets)
+	assert list(merged.keys()) == ['pack1', 'pack2', 'pack3']
+	assert merged['pack1'] == VersionRange('>1.7,<=3')
+	assert merged['pack2'] == VersionRange('>=2,<5')
+	assert merged['pack3'] == VersionRange('==2.*')
+
+
+def test_merge_dependency_sets_conflict():
+	sets = [parse_dependencies('pack<2'), parse_dependencies('pack>3')]
+	assert merge_dependency_sets(sets, conflict='silent')['pack'] == VersionRange('>3_')
+	with raises(VersionRangeMismatch):
+		merge_dependency_sets(sets, conflict='error')
+
+
@@ -0,0 +1,59 @@
+
+from pytest import raises
+from .rangeset import VersionRangeSet
+from .settings import VersionRangeMismatch
+from .versions import VersionRange
+
+
+OPTIONS = ['0.0.0', '2.8.', '2.1.unordered', '1.0.dev1', '2.2.words', '2.5.1', '2.9.9', '999.999.0']
+
+
+def test_parse_union_and_exclusion():
+	union = VersionRangeSet('<2.0 or >=3.1')
+	assert '1.9' in union and '3.1' in union and '5.0' in union
+	assert '2.0' not in union and '3.0.7' not in union
+	assert VersionRangeSet('<2.0 | >=3.1') == VersionRangeSet('>=3.1||<2.0') == union
+	excluded = VersionRangeSet('>=2,<3,!=2.5')
+	assert '2.4' in excluded and '2.6' in excluded and '2.5.1' not in excluded
+	assert len(excluded.intervals) == 2
+	assert VersionRangeSet('==2.*,!=2.*') == VersionRangeSet('!=*')
+	assert not VersionRangeSet('!=*')
+
+
+def test_set_algebra():
+	first = VersionRangeSet('>=1,<3')
+	second = VersionRangeSet('>=2,<4 or >=6')
+	assert first | second == VersionRangeSet('>=1,<4 or >=6')
+	assert first & second == VersionRangeSet('>=2,<3')
+	assert first - second == VersionRangeSet('>=1,<2')
+	assert second - first == VersionRangeSet('>=3,<4 or >=6')
+	assert ~first == VersionRangeSet('<1 or >=3')
+	assert ~~second == second
+	assert first & VersionRange('>=2.5') == VersionRangeSet('>=2.5,<3')
+	assert (first | ~first) == VersionRangeSet('==*')
+	assert len({first, VersionRangeSet('<3,>=1')}) == 1
+
+
+def test_adjacent_merged():
+	assert VersionRangeSet('<2.0 or >=2.0,<3') == VersionRangeSet('<3')
+	assert VersionRangeSet('<=2.4 or >=2.5').intervals == VersionRangeSet('==*').intervals
+
+
+def test_choose():
+	assert VersionRangeSet('<2.0 or >=2.2,<2.9').choose(OPTIONS) == '2.8.'
+	assert VersionRangeSet('>=2.2,<3,!=2.9,!=2.8').choose(OPTIONS) == '2.5.1'
+	assert VersionRangeSet('<2.2 or >=2.6,<2.8').choose(OPTIONS) == '2.1.unordered'
+	assert VersionRangeSet('>=3,<4').choose(OPTIONS[:-1]) == '2.9.9'
+	assert VersionRangeSet('>=2.3,<2.5').choose(OPTIONS) == '2.5.1'
+	for selection in ('>=2.2,<2.9', '>2.2,<2.7', '>2.2', '<2.9', '>10,<20'):
+		assert VersionRangeSet(selection).choose(OPTIONS) == VersionRange(selection).choose(OPTIONS)
+	with raises(VersionRangeMismatch):
+		VersionRangeSet('<2.0').choose([])
+
+
+def test_str_round_trip():
+	for selections in ('<2.0 or >=3.1', '>=2,<3,!=2.5', '==*', '!=*', '==1.7 or ==1.9'):
+		rangeset = VersionRangeSet(selections)
+		assert VersionRangeSet(str(rangeset)) == rangeset
+
+
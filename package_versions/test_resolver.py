@@ -0,0 +1,111 @@
+
+from pytest import raises
+from .resolver import Resolver, resolve
+from .settings import VersionRangeMismatch
+from .versions import VersionRange
+
+
+INDEX = {
+	'app': {
+		'1.0': 'web>=2\ndb<3',
+		'2.0': ['web>=3', 'db>=3'],
+	},
+	'web': {
+		'2.0': 'util==1.*',
+		'3.0': 'util>=2',
+		'3.1': 'util>=2,<3\ndb<=2.5',
+	},
+	'db': {
+		'2.0': 'util==1.*',
+		'2.5': 'util>=1',
+		'3.0': '',
+	},
+	'util': {
+		'1.0': None,
+		'1.4': None,
+		'2.0': None,
+		'3.0': None,
+	},
+}
+
+
+def check(resolution, index=INDEX):
+	""" Every dependency of every chosen version is present and in range. """
+	for name, version in resolution.items():
+		for dep, vrange in Resolver(index).dependencies(name, version).items():
+			assert resolution[dep] in vrange
+
+
+def test_resolve_simple():
+	resolution = resolve('app==1.*', INDEX)
+	assert resolution['app'] == '1.0'
+	assert resolution['web'] == '3.1'
+	assert resolution['db'] == '2.5'
+	assert resolution['util'] == '2.0'
+	check(resolution)
+
+
+def test_resolve_backtracks():
+	""" The highest app needs db>=3, but web 3.1 needs db<=2.5, so web 3.0 is used. """
+	resolver = Resolver(INDEX)
+	resolution = resolver.resolve({'app': VersionRange('>=2')})
+	assert resolution == {'app': '2.0', 'web': '3.0', 'db': '3.0', 'util': '3.0'}
+	check(resolution)
+	assert resolver.stats['nodes'] > 0
+	assert resolver.stats['time'] >= 0
+	assert resolver.stats['backtracks'] >= 1
+
+
+def test_resolve_with_extra_constraint():
+	resolution = resolve('app==1.*\nutil<2', INDEX)
+	assert resolution['util'] == '1.4'
+	assert resolution['web'] == '2.0'
+	check(resolution)
+
+
+def test_resolve_memo_reused():
+	resolver = Resolver(INDEX)
+	first = resolver.resolve('app==1.*')
+	assert resolver.resolve('app==1.*') == first
+	assert resolver.stats['memo_hits'] >= 1
+	assert resolver.stats['nodes'] == 0
+
+
+def test_resolve_impossible():
+	with raises(VersionRangeMismatch):
+		resolve('app==2.*\ndb<3', INDEX)
+	with raises(VersionRangeMismatch):
+		resolve('missing>1', INDEX)
+
+
+def test_resolve_cycle():
+	index = {'a': {'1.0': 'b>=1'}, 'b': {'1.0': 'a==1.0', '2.0': 'a>=2'}}
+	assert resolve('a==*', index) == {'a': '1.0', 'b': '1.0'}
+
+
+def test_resolve_locked():
+	resolver = Resolver(INDEX)
+	assert resolver.resolve('app==1.*', locked={'app': '1.0', 'web': '2.0'})['web'] == '2.0'
+	assert resolver.resolve('app==1.*', locked={'app': '2.0'}) == resolve('app==1.*', INDEX)
+	assert resolver.resolve('app==1.*', locked={'app': '9.0'}) == resolve('app==1.*', INDEX)
+	assert resolver.resolve('web==2.*', locked={'web': '2.0', 'db': '3.0', 'app': '1.0'}) == {'web': '2.0', 'util': '1.4'}
+
+
+def test_resolve_subtree_conflict_falls_back():
+	index = {'a': {'1.0': 'c==1.0', '2.0': 'c==2.0'}, 'b': {'1.0': 'c==1.0'}, 'c': {'1.0': '', '2.0': ''}}
+	expected = {'a': '1.0', 'b': '1.0', 'c': '1.0'}
+	assert dict(Resolver(index).resolve('a==*\nb==*')) == expected
+	assert dict(Resolver(index).resolve('b==*\na==*')) == expected
+
+
+def test_resolve_large_without_recursion():
+	chain = dict(('p{0:d}'.format(k), {'1.0': 'p{0:d}==1.*'.format(k + 1), '2.0': 'p{0:d}>=9'.format(k + 1)}) for k in range(600))
+	chain['p600'] = {'1.0': None}
+	resolution = resolve('p0==*', chain)
+	assert len(resolution) == 601 and all(version == '1.0' for version in resolution.values())
+	flat = dict(('p{0:d}'.format(k), {'1.0': None, '2.0': None}) for k in range(1200))
+	resolution = resolve(dict((name, VersionRange('==*')) for name in flat), flat)
+	assert list(resolution.keys()) == list(flat.keys())
+	assert set(resolution.values()) == {'2.0'}
+
+
@@ -0,0 +1,42 @@
+
+from pytest import raises
+from .scanner import scan_dependency, iter_selection_tokens
+from .versions import VersionRange, parse_dependency
+from .settings import VersionFormatError, VersionRangeMismatch
+
+
+def test_scan_dependency():
+	assert scan_dependency('Package>=1.3,<2 # comment') == ('package', '>=1.3,<2')
+	assert scan_dependency('package==*') == ('package', '==*')
+	assert scan_dependency('  # only a comment') is None
+	assert scan_dependency('') is None
+
+
+def test_scan_errors():
+	for txt in ('package', '>=1.3', '1package>2', 'package>=1.3.5', 'package>=123456', 'package>=1,,<2',
+			'package>=9=1', 'package >= 1', 'a' * 33 + '>1'):
+		with raises(VersionFormatError):
+			scan_dependency(txt)
+
+
+def test_selection_tokens():
+	assert list(iter_selection_tokens('>=1.3,<2,==*,>4.,<=5.*')) == [
+		('>=', '1', '3'), ('<', '2', ''), ('==', '*', ''), ('>', '4', ''), ('<=', '5', '*')]
+
+
+def test_from_tokens():
+	for selections in ('>=1.3,<2', '==2.*', '>4.,<=5.7', '==*', '<3,>1'):
+		assert VersionRange.from_tokens(iter_selection_tokens(selections)) == VersionRange(selections)
+	assert parse_dependency('package>2.0,<3') == ('package', VersionRange('>2.0,<3'))
+
+
+def test_from_tokens_errors():
+	with raises(VersionFormatError):
+		VersionRange().apply_selection('!=', '1', '2')
+	with raises(VersionFormatError):
+		VersionRange.from_tokens([('~=', '1', '2')])
+	with raises(VersionRangeMismatch) as info:
+		VersionRange.from_tokens(iter_selection_tokens('<2,>3'))
+	assert '"<2,>3"' in str(info.value)
+
+
@@ -0,0 +1,60 @@
+
+from io import BytesIO
+from pytest import raises
+from .serialize import dumps_dependencies, dump_dependencies, loads_dependencies, load_dependencies, SerializationError, RECORD
+from .versions import VersionRange, parse_dependencies
+
+
+def make_dependencies():
+	dependencies = parse_dependencies(TEXT)
+	dependencies['low'] = VersionRange('>=2.3_')
+	dependencies['other'] = VersionRange('<2.3', mx=100)
+	return dependencies
+
+
+TEXT = 'pack1>1.7\npack2>1.3,<6\ndup<=2.7\ndup>2.0\nwild==*\nsingle==3.1'
+
+
+def test_round_trip():
+	dependencies = make_dependencies()
+	view = loads_dependencies(dumps_dependencies(dependencies))
+	assert len(view) == len(dependencies)
+	assert list(view) == list(dependencies)
+	for name, vrange in dependencies.items():
+		assert str(view[name]) == str(vrange)
+		assert view[name] == vrange
+	assert view.to_dict() == dependencies
+	assert 'missing' not in view
+	with raises(KeyError):
+		view['missing']
+
+
+def test_compact():
+	dependencies = make_dependencies()
+	data = dumps_dependencies(dependencies)
+	assert len(data) < 16 + len(dependencies) * RECORD.size + sum(len(name.encode('utf-8')) for name in dependencies) + 1
+
+
+def test_files(tmp_path):
+	dependencies = make_dependencies()
+	path = str(tmp_path / 'deps.bin')
+	dump_dependencies(dependencies, path)
+	with load_dependencies(path) as view:
+		assert view.to_dict() == dependencies
+	with load_dependencies(path, use_mmap=False) as view:
+		assert view['dup'] == VersionRange('>2.0,<=2.7')
+	buffer = BytesIO()
+	dump_dependencies(dependencies, buffer)
+	assert loads_dependencies(buffer.getvalue()).to_dict() == dependencies
+
+
+def test_invalid():
+	with raises(SerializationError):
+		loads_dependencies(b'PV')
+	with raises(SerializationError):
+		loads_dependencies(b'NOPE' + bytes(8))
+	data = dumps_dependencies(parse_dependencies(TEXT))
+	with raises(SerializationError):
+		loads_dependencies(data[:20])
+
+
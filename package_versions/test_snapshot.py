@@ -0,0 +1,69 @@
+
+from threading import Event, Thread
+from timeit import default_timer
+from pytest import raises
+from .settings import VersionRangeMismatch
+from .snapshot import SnapshotCatalog
+from .versions import VersionRange
+
+
+def test_snapshot_update():
+	catalog = SnapshotCatalog({'pack': ['1.0', '2.0']})
+	before = catalog.snapshot()
+	catalog.update({'pack': ['2.5', '1.0'], 'other': ['0.1']})
+	assert list(before['pack']) == ['1.0', '2.0']
+	assert list(catalog.snapshot()['pack']) == ['1.0', '2.0', '2.5']
+	assert catalog.choose('pack', VersionRange('<3')) == '2.5'
+	assert catalog.generation == 2
+	assert len(catalog) == 2 and 'other' in catalog
+	with raises(VersionRangeMismatch):
+		catalog.choose('missing', VersionRange())
+	with raises(TypeError):
+		catalog.snapshot()['new'] = None
+
+
+def test_read_throughput_under_writes(record_property):
+	""" Readers keep answering from consistent snapshots, without waiting, while a writer publishes releases. """
+	catalog = SnapshotCatalog({'pack{0:d}'.format(k): ['1.0'] for k in range(20)})
+	vrange = VersionRange('>=1.0')
+	duration = 0.3
+	writing = Event()
+	reads, reads_while_writing, generations, errors = [], [], set(), []
+
+	def reader():
+		count = while_writing = 0
+		end = default_timer() + duration
+		while default_timer() < end:
+			snapshot = catalog.snapshot()
+			generations.add(catalog.generation)
+			for name, versions in snapshot.items():
+				chosen = vrange.choose(versions)
+				if '1.{0:d}'.format(len(versions) - 1) != chosen:
+					errors.append((name, chosen))
+				count += 1
+				if writing.is_set():
+					while_writing += 1
+		reads.append(count)
+		reads_while_writing.append(while_writing)
+
+	def writer():
+		minor, end = 1, default_timer() + duration
+		writing.set()
+		while default_timer() < end:
+			catalog.update(('pack{0:d}'.format(k), ['1.{0:d}'.format(minor)]) for k in range(20))
+			minor += 1
+		writing.clear()
+
+	threads = [Thread(target=reader) for k in range(4)] + [Thread(target=writer)]
+	start = default_timer()
+	for thread in threads:
+		thread.start()
+	for thread in threads:
+		thread.join()
+	throughput = sum(reads) / (default_timer() - start)
+	record_property('reads_per_second', throughput)
+	assert not errors
+	assert all(count > 0 for count in reads_while_writing), 'readers were blocked while the writer was active'
+	assert len(generations) > 2, 'readers did not see new snapshots while they were published'
+
+
@@ -0,0 +1,45 @@
+
+from pytest import raises
+from .sqlstore import SQLiteCatalog
+from .settings import VersionRangeMismatch
+from .versions import VersionRange
+
+
+OPTIONS = ['0.0.0', '2.8.', '2.1.unordered', '1.0.dev1', '2.2.words', '2.9.9', '999.999.0']
+SELECTIONS = ('>=2.2,<2.9', '>=2.2,<=2.9', '>2.2,<2.7', '>2.2', '<2.9', '<=2.9', '>2.9,<7.0', '>10,<20', '==1.*')
+
+
+def test_choose_same_as_range():
+	catalog = SQLiteCatalog()
+	catalog.import_releases({'pack': OPTIONS, 'short': OPTIONS[:-1]}, batch_size=3)
+	for selection in SELECTIONS:
+		vrange = VersionRange(selection)
+		assert catalog.choose('pack', vrange) == vrange.choose(OPTIONS)
+		assert catalog.choose('short', vrange) == vrange.choose(OPTIONS[:-1])
+	with raises(VersionRangeMismatch):
+		catalog.choose('missing', VersionRange())
+	with raises(VersionRangeMismatch):
+		catalog.choose('pack', VersionRange('>1000'), conflict='error')
+
+
+def test_ties_and_duplicates():
+	catalog = SQLiteCatalog()
+	catalog.add_versions('pack', ['1.2.b', '1.2.a', '3.0.a', '3.0.b', '1.2.a', '3.0.10'])
+	assert catalog.versions('pack') == ['1.2.b', '1.2.a', '3.0.a', '3.0.b', '3.0.10']
+	for selection in ('<2', '>=2', '<1', '>5'):
+		assert catalog.choose('pack', VersionRange(selection)) == VersionRange(selection).choose(catalog.versions('pack'))
+
+
+def test_persistent(tmp_path):
+	path = str(tmp_path / 'catalog.sqlite')
+	catalog = SQLiteCatalog(path)
+	catalog.add_versions('pack', ['1.0', '2.0'])
+	catalog.close()
+	catalog = SQLiteCatalog(path)
+	assert catalog.packages() == ['pack']
+	assert catalog.choose('pack', VersionRange('<2')) == '1.0'
+	catalog.close()
+	with raises(ValueError):
+		SQLiteCatalog(path, mx=100)
+
+
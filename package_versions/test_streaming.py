@@ -0,0 +1,39 @@
+
+from io import StringIO, BytesIO
+from pytest import raises
+from .streaming import iter_dependencies, read_dependencies
+from .versions import VersionRange, parse_dependencies
+from .settings import VersionRangeMismatch
+
+
+TEXT = 'PACK1>1.7\npack2>1.3,<6\ndup<=2.7\n#pack3==*\n\npack4<3.4#,>1.2\ndup>2.0#\n#'
+
+
+def test_iter_dependencies():
+	found = list(iter_dependencies(StringIO(TEXT)))
+	assert [name for name, vrange in found] == ['pack1', 'pack2', 'dup', 'pack4', 'dup']
+	assert found[0][1] == VersionRange('>1.7')
+
+
+def test_read_dependencies_sources(tmp_path):
+	path = tmp_path / 'requirements.txt'
+	path.write_text(TEXT)
+	reference = parse_dependencies(TEXT)
+	assert read_dependencies(StringIO(TEXT)) == reference
+	assert read_dependencies(BytesIO(TEXT.encode('utf-8'))) == reference
+	assert read_dependencies(str(path)) == reference
+	assert read_dependencies(str(path), use_mmap=True) == reference
+	assert list(read_dependencies(str(path), use_mmap=True).keys()) == list(reference.keys())
+
+
+def test_read_dependencies_empty(tmp_path):
+	path = tmp_path / 'empty.txt'
+	path.write_text('')
+	assert len(read_dependencies(str(path), use_mmap=True)) == 0
+
+
+def test_read_dependencies_duplicates():
+	with raises(VersionRangeMismatch):
+		read_dependencies(StringIO('dup<=2.7\ndup>2.0'), duplicates='error')
+
+
@@ -0,0 +1,49 @@
+
+from sys import getsizeof
+from pytest import raises
+from .convert import str2nr
+from .versionarray import VersionArray
+
+
+OPTIONS = ['0.0.0', '2.8', '2.1.unordered', '1.0.dev1', '2.2.words', '2.9.9', '999.999.0']
+
+
+def test_round_trip():
+	versions = VersionArray(OPTIONS)
+	assert len(versions) == len(OPTIONS)
+	assert list(versions) == OPTIONS
+	assert versions[-1] == '999.999.0'
+	assert versions.rest(2) == 'unordered'
+	assert list(versions.numbers) == [str2nr(version) for version in OPTIONS]
+	with raises(IndexError):
+		versions[len(OPTIONS)]
+	versions.append('3.1.rc2')
+	assert versions[7] == '3.1.rc2'
+
+
+def test_slicing():
+	versions = VersionArray(OPTIONS)
+	assert list(versions[2:5]) == OPTIONS[2:5]
+	assert list(versions[::2]) == OPTIONS[::2]
+	assert list(versions[5:2]) == []
+	assert list(versions[2:5][1:]) == OPTIONS[3:5]
+
+
+def test_sorting():
+	versions = VersionArray(OPTIONS)
+	expected = sorted(OPTIONS, key=str2nr)
+	assert list(versions.sorted()) == expected
+	view = versions.sorted_view()
+	assert list(view) == expected
+	assert view[0] == expected[0]
+	assert list(view[-2:]) == expected[-2:]
+	assert list(view.copy()) == expected
+	assert list(view.numbers) == sorted(versions.numbers)
+
+
+def test_compact():
+	versions = VersionArray('{0:d}.{1:d}.dev{0:d}'.format(major, minor) for major in range(100) for minor in range(100))
+	size = getsizeof(versions.numbers) + getsizeof(versions.offsets) + getsizeof(versions.rests)
+	assert size < 30 * len(versions)
+
+
@@ -1,7 +1,11 @@
 
 from collections import OrderedDict
 from pytest import raises
-from .versions import VersionRange, parse_dependency, parse_dependencies
+from copy import deepcopy
+from pickle import dumps, loads
+from .versions import VersionRange, FrozenVersionRange, parse_dependency, parse_dependencies
+from .catalog import VersionCatalog
+from .convert import str2nr3
 from .settings import VersionRangeMismatch, VersionFormatError
 
 
@@ -248,6 +252,53 @@ def test_choose():
 	assert VersionRange('>10,<20').choose(options[:-1]) == '2.9.9'
 
 
+def test_choose_pre_release():
+	for options in (['2.9.9', '2.9.9rc1'], ['2.9.9rc1', '2.9.9']):
+		assert VersionRange('==2.9').choose(options) == '2.9.9'
+		assert VersionRange('==2.9').choose(VersionCatalog(options)) == '2.9.9'
+	assert VersionRange('==2.9').choose(['2.9', '2.9.dev1']) == '2.9'
+	assert VersionRange('>3').choose(['2.9.dev1', '2.9', '2.9.post1']) == '2.9.post1'
+
+
+def test_frozen_interning():
+	frozen = VersionRange('>=1.3,<2.0').freeze()
+	assert frozen is FrozenVersionRange.parse('>=1.3,<2.0')
+	assert frozen is deepcopy(frozen) is loads(dumps(frozen))
+	assert not hasattr(frozen, '__dict__')
+	assert str(frozen) == '>=1.3,<2.0'
+	assert frozen.thaw() == VersionRange('>=1.3,<2.0')
+	with raises(AttributeError):
+		frozen.min = 0
+
+
+def test_frozen_hashable():
+	ranges = {FrozenVersionRange.parse('>=1.3,<2.0'): 'a', FrozenVersionRange.parse('==2.*'): 'b'}
+	assert ranges[VersionRange('<2.0,>=1.3').freeze()] == 'a'
+	assert len({FrozenVersionRange.parse('<3.5'), FrozenVersionRange.parse('<3.5_')}) == 1
+
+
+def test_frozen_intersection():
+	pairs = (('<=2.5,>1', '==2.*'), ('<4.4', '>0,<=7'), ('<4.4', '>5.3'), ('>=2,<4', '>5.0,<=7.0'), ('<3.5_', '>2'))
+	for first, second in pairs:
+		frozen = FrozenVersionRange.parse(first) & FrozenVersionRange.parse(second)
+		assert frozen is FrozenVersionRange.parse(first) & FrozenVersionRange.parse(second)
+		assert frozen.thaw() == VersionRange(first) & VersionRange(second)
+	with raises(NotImplementedError):
+		FrozenVersionRange.parse('<2') & VersionRange('>1')
+
+
+def test_wide_bounds():
+	for selection in ('>=2.2,<2.9', '>2.2', '<=2.9', '==1.*', '==*'):
+		vrange = VersionRange(selection)
+		low, high = vrange.wide_bounds()
+		for version in ('0.0', '1.0.dev1', '2.2.0', '2.8.99', '2.9.0', '2.9.2097140', '3.0.0', '999.999.999'):
+			assert (low <= str2nr3(version) <= high) == (version in vrange)
+	low, high = VersionRange('>2').wide_bounds()
+	assert low <= str2nr3('50000.0') <= high
+	low, high = VersionRange('<3').wide_bounds()
+	assert low <= str2nr3('2.50000') <= high < str2nr3('3.0')
+
+
 #todo: test and make choosing based on 3rd part of version (alphabetic?)
 
 
@@ -0,0 +1,143 @@
+
+"""
+	Memory-efficient storage of many versions.
+"""
+
+from array import array
+from .convert import str2nrrest, nrrest2str, rest_key
+from .settings import VERSION_MAX
+
+
+class VersionArray(object):
+	"""
+	Compact list of versions, which stores the encoded major and minor numbers (see `str2nrrest`)
+	in an integer array and all the rest parts in a single buffer.
+
+	Items are converted back to text with `nrrest2str` when accessed, so '2.8.' comes back as '2.8'.
+	"""
+	def __init__(self, versions=(), mx=VERSION_MAX):
+		"""
+		:param versions: Iterable of version strings.
+		"""
+		self.limit = mx
+		self.numbers = array('q')
+		self.offsets = array('q', [0])
+		self.rests = bytearray()
+		self.extend(versions)
+
+	def append(self, version):
+		nr, rest = str2nrrest(version, mx=self.limit)
+		self.append_nrrest(nr, rest)
+
+	def append_nrrest(self, nr, rest):
+		self.numbers.append(nr)
+		self.rests.extend(rest.encode('utf-8'))
+		self.offsets.append(len(self.rests))
+
+	def extend(self, versions):
+		for version in versions:
+			self.append(version)
+
+	def __len__(self):
+		return len(self.numbers)
+
+	def _index(self, index):
+		if index < 0:
+			index += len(self)
+		if not 0 <= index < len(self):
+			raise IndexError('{0:s} index out of range'.format(self.__class__.__name__))
+		return index
+
+	def rest(self, index):
+		"""
+		The part of the version after major and minor, as a string.
+		"""
+		index = self._index(index)
+		return self.rests[self.offsets[index]:self.offsets[index + 1]].decode('utf-8')
+
+	def nrrest(self, index):
+		index = self._index(index)
+		return self.numbers[index], self.rest(index)
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			start, stop, step = index.indices(len(self))
+			if step == 1:
+				return self._copy_range(start, max(start, stop))
+			return self.take(range(start, stop, step))
+		return nrrest2str(*self.nrrest(index), mx=self.limit)
+
+	def __iter__(self):
+		for index in range(len(self)):
+			yield self[index]
+
+	def _copy_range(self, start, stop):
+		copy = self.__class__(mx=self.limit)
+		copy.numbers = self.numbers[start:stop]
+		first = self.offsets[start]
+		copy.offsets = array('q', (offset - first for offset in self.offsets[start:stop + 1]))
+		copy.rests = self.rests[first:self.offsets[stop]]
+		return copy
+
+	def take(self, indices):
+		"""
+		A new VersionArray with the versions at the given indices, in that order.
+		"""
+		copy = self.__class__(mx=self.limit)
+		for index in indices:
+			index = self._index(index)
+			copy.numbers.append(self.numbers[index])
+			copy.rests.extend(self.rests[self.offsets[index]:self.offsets[index + 1]])
+			copy.offsets.append(len(copy.rests))
+		return copy
+
+	def argsort(self):
+		"""
+		Indices that put the versions in order of their number and rest (stable for equal versions).
+		"""
+		return array('q', sorted(range(len(self)), key=lambda index: (self.numbers[index], rest_key(self.rest(index)))))
+
+	def sorted(self):
+		""" A sorted copy. """
+		return self.take(self.argsort())
+
+	def sorted_view(self):
+		""" A sorted read-only view, which shares the storage of this array. """
+		return VersionArrayView(self, self.argsort())
+
+	def __repr__(self):
+		return '{0:s}({1:d} versions)'.format(self.__class__.__name__, len(self))
+
+
+class VersionArrayView(object):
+	"""
+	Read-only view of a VersionArray in a different order, see `VersionArray.sorted_view`.
+	"""
+	def __init__(self, base, indices):
+		self.base = base
+		self.indices = indices
+
+	def __len__(self):
+		return len(self.indices)
+
+	def __getitem__(self, index):
+		if isinstance(index, slice):
+			return self.__class__(self.base, self.indices[index])
+		return self.base[self.indices[index]]
+
+	def __iter__(self):
+		for index in self.indices:
+			yield self.base[index]
+
+	@property
+	def numbers(self):
+		return array('q', (self.base.numbers[index] for index in self.indices))
+
+	def copy(self):
+		""" A VersionArray with the versions in the order of this view. """
+		return self.base.take(self.indices)
+
+	def __repr__(self):
+		return '{0:s}({1:d} versions)'.format(self.__class__.__name__, len(self))
+
+
@@ -4,24 +4,202 @@
 """
 
 from collections import OrderedDict
-from logging import warning
-from re import findall
-from .convert import to_tup, to_nr, str2nr
-from .settings import VersionRangeMismatch, VersionFormatError, VERSION_MAX, PACKAGE_RANGE_PATTERN
+from itertools import islice
+from weakref import WeakValueDictionary
+from re import compile as re_compile
+from timeit import default_timer
+from .cache import LRUCache
+from .catalog import VersionCatalog
+from .conflicts import ConflictEvent, check_conflict_mode, version_problem_notify
+from .convert import to_tup, to_nr, str2nr, str2nrrest, rest_key, to_nr3
+from .instrument import instrumentation
+from .scanner import scan_dependency, iter_selection_tokens
+from .settings import VersionRangeMismatch, VersionFormatError, VERSION_MAX, VERSION_WIDE_MAX, SELECTION_CACHE_SIZE, \
+	INTERSECTION_CACHE_SIZE
 
 
-def version_problem_notify(txt, conflict):
-	if conflict == 'silent':
-		return
-	elif conflict == 'warning':
-		warning(txt)
-	elif conflict == 'error':
-		raise VersionRangeMismatch(txt)
-	else:
-		raise NotImplementedError('Unknown conflict mode "{0:}"'.format(conflict))
+selection_cache = LRUCache(maxsize=SELECTION_CACHE_SIZE)
+intersection_cache = LRUCache(maxsize=INTERSECTION_CACHE_SIZE)
 
+SELECTION_REGEX = re_compile(r'^([><=]=?)(\d+|\*)(?:\.(\d*|\*))?$')
 
-class VersionRange():
+
+class BaseVersionRange(object):
+	"""
+	Read-only behaviour shared by `VersionRange` and `FrozenVersionRange`.
+
+	Subclasses provide the attributes `min`, `max` (encoded numbers), `prefer_highest` and `limit`.
+	"""
+	__slots__ = ()
+
+	@property
+	def highest(self):
+		return (self.limit + 1) * self.limit
+
+	def to_tup(self, nr):
+		return to_tup(nr, mx=self.limit)
+
+	def to_nr(self, major, minor):
+		return to_nr(major, minor, mx=self.limit)
+
+	def wide_bounds(self, mx=VERSION_WIDE_MAX):
+		"""
+		The minimum and maximum in the encoding that includes the patch number (see `to_nr3`),
+		from patch 0 of the minimum to the last patch of the maximum. Selections can't specify patches.
+
+		Maxima that mean 'any minor' or 'no maximum' in this range's encoding become the same in the wide one,
+		so versions with numbers above this range's limit are still included.
+		"""
+		min_major, min_minor = self.to_tup(self.min)
+		if self.max >= self.highest:
+			return to_nr3(min_major, min_minor, 0, mx=mx), to_nr3(mx, mx, mx, mx=mx)
+		max_major, max_minor = self.to_tup(self.max)
+		if max_minor == self.limit - 1:
+			max_minor = mx - 1
+		return to_nr3(min_major, min_minor, 0, mx=mx), to_nr3(max_major, max_minor, mx - 1, mx=mx)
+
+	def choose(self, versions, conflict='silent'):
+		"""
+		Choose the highest version in the range.
+
+		:param versions: Iterable of available versions, or a VersionCatalog to reuse the parsed versions.
+		"""
+		check_conflict_mode(conflict)
+		if isinstance(versions, VersionCatalog) and versions.limit == self.limit:
+			if not versions:
+				raise VersionRangeMismatch('No versions to choose from')
+			in_range = versions.highest_in(self.min, self.max)
+			above = highest = None
+			if not in_range:
+				above = versions.lowest_above(self.max)
+				if not above:
+					highest = versions.highest()
+		else:
+			versions = list(versions)
+			if not versions:
+				raise VersionRangeMismatch('No versions to choose from')
+			in_range, above, highest = self._scan(versions)
+		""" Try to find the highest value in range. """
+		if in_range:
+			if instrumentation.enabled:
+				instrumentation.count('choose_in_range')
+			return in_range
+		""" We need to look outside the range, so maybe give a warning. """
+		if conflict != 'silent':
+			version_problem_notify(ConflictEvent('no_match', ranges=(self,), options=versions, mx=self.limit), conflict=conflict)
+		""" Failing the above, try to find the lowest value above the range. """
+		if above:
+			if instrumentation.enabled:
+				instrumentation.count('choose_above')
+			return above
+		""" Failing the above two, try to highest value below the range (so just the highest). """
+		if instrumentation.enabled:
+			instrumentation.count('choose_highest' if highest else 'choose_none')
+		return highest
+
+	def _scan(self, versions):
+		"""
+		The highest version in the range, lowest above it and highest overall, in one pass over a list of versions.
+
+		Only the first is determined if there is one. Uses the same order as VersionCatalog, but only compares the rest
+		of versions with the same number.
+		"""
+		low, high, top, limit = self.min, self.max, self.highest, self.limit
+		in_range = above = highest = None
+		in_nr, above_nr, highest_nr = -1, top, 0
+		in_rest = above_rest = highest_rest = ''
+		for version in versions:
+			nr, rest = str2nrrest(version, mx=limit)
+			if low <= nr <= high:
+				if nr > in_nr or (nr == in_nr and rest_key(rest) >= rest_key(in_rest)):
+					in_range, in_nr, in_rest = version, nr, rest
+			elif in_range is None:
+				if high < nr < above_nr or (nr == above_nr and rest_key(rest) < rest_key(above_rest)):
+					above, above_nr, above_rest = version, nr, rest
+				if nr > highest_nr or (nr == highest_nr > 0 and rest_key(rest) >= rest_key(highest_rest)):
+					highest, highest_nr, highest_rest = version, nr, rest
+		return in_range, above, highest
+
+	def rank(self, versions):
+		"""
+		Generate the versions from most to least preferred, see `VersionCatalog.rank`.
+
+		:param versions: Iterable of available versions, or a VersionCatalog to reuse the parsed versions.
+		"""
+		if not isinstance(versions, VersionCatalog) or versions.limit != self.limit:
+			versions = VersionCatalog(versions, mx=self.limit)
+		return versions.rank(self)
+
+	def choose_many(self, versions, k, conflict='silent'):
+		"""
+		The k most preferred versions, the first one being the one `choose` gives. Use `rank` to get more later.
+
+		:param versions: Iterable of available versions, or a VersionCatalog to reuse the parsed versions.
+		"""
+		check_conflict_mode(conflict)
+		if not isinstance(versions, VersionCatalog) or versions.limit != self.limit:
+			versions = VersionCatalog(versions, mx=self.limit)
+		if not versions:
+			raise VersionRangeMismatch('No versions to choose from')
+		if conflict != 'silent' and versions.highest_in(self.min, self.max) is None:
+			version_problem_notify(ConflictEvent('no_match', ranges=(self,), options=versions, mx=self.limit), conflict=conflict)
+		return list(islice(versions.rank(self), k))
+
+	def __contains__(self, version):
+		return self.min <= str2nr(version, mx=self.limit) <= self.max
+
+	def __eq__(self, other):
+		if not type(self) is type(other):
+			return False
+		if not self.min == other.min:
+			return False
+		if not self.max == other.max:
+			return False
+		if self.min > 0:
+			if not self.prefer_highest == other.prefer_highest:
+				return False
+		return True
+
+	def __str__(self):
+		if self.min <= 0 and self.max >= self.highest:
+			return '==*'
+		min1, min2 = self.to_tup(self.min)
+		if self.min == self.max:
+			return '=={0:d}.{1:d}'.format(min1, min2)
+		max1, max2 = self.to_tup(self.max)
+		parts = []
+		if self.min > 0:
+			parts.append(
+				'>={0:d}.{1:d}'.format(min1, min2)
+			)
+			if self.max < self.highest:
+				parts.append(',')
+		if self.max < self.highest:
+			if max2 == self.limit - 1:
+				if min2 == 0 and min1 == max1 - 2:
+					return '=={0:d}.*'.format(min1)
+				else:
+					parts.append(
+						'<{0:d}.0'.format(max1 + 1)
+					)
+			else:
+				parts.append(
+					'<={0:d}.{1:d}'.format(max1, max2)
+				)
+		if not self.prefer_highest and self.min > 0:
+			parts.append('_')
+		return ''.join(parts)
+
+	def __repr__(self):
+		return '{1:s}({0:s})'.format(self.__str__(), self.__class__.__name__)
+
+	def __format__(self, format_spec):
+		if format_spec == 's':
+			return str(self)
+		return super(BaseVersionRange, self).__format__(format_spec)
+
+
+class VersionRange(BaseVersionRange):
 	"""
 	Represent a range of versions. Versions have the format 'int.int' in this class.
 
@@ -30,9 +208,16 @@ class VersionRange():
 	"""
 	def __init__(self, selections='==*', mx=VERSION_MAX):
 		"""
-		:param selections: A selection string, like '>=1.3,<2.0'.
+		:param selections: A selection string, like '>=1.3,<2.0'. Parsed results are cached in `selection_cache`.
 		"""
 		self.limit = mx
+		parsed = selection_cache.get((selections, mx))
+		if parsed is not None:
+			self.min, self.max, self.prefer_highest = parsed
+			if instrumentation.enabled:
+				instrumentation.count('range_cached')
+			return
+		start = default_timer() if instrumentation.enabled else None
 		self.min = 0
 		self.max = self.highest
 		self.prefer_highest = True
@@ -40,14 +225,55 @@ class VersionRange():
 			self.add_selections(selections, conflict='error')
 		except VersionRangeMismatch:
 			raise VersionRangeMismatch('"{0:s}" contains conflicting directives'.format(selections))
+		selection_cache.put((selections, mx), (self.min, self.max, self.prefer_highest))
+		if start is not None:
+			instrumentation.timed('range_parse', default_timer() - start)
 
-	@property
-	def highest(self):
-		return (self.limit + 1) * self.limit
+	@classmethod
+	def from_tokens(cls, tokens, selections=None, mx=VERSION_MAX):
+		"""
+		Create a range from already split selections (see `apply_selection`), skipping the text parsing.
+
+		:param selections: The text the tokens came from; if given, the result is cached like it is for `__init__`.
+		"""
+		if selections is not None:
+			parsed = selection_cache.get((selections, mx))
+			if parsed is not None:
+				if instrumentation.enabled:
+					instrumentation.count('range_cached')
+				return cls.from_bounds(*parsed, mx=mx)
+		start = default_timer() if instrumentation.enabled else None
+		tokens = list(tokens)
+		inst = cls.from_bounds(0, (mx + 1) * mx, mx=mx)
+		try:
+			for operation, majorstr, minorstr in tokens:
+				inst.apply_selection(operation, majorstr, minorstr, conflict='error')
+		except VersionRangeMismatch:
+			if selections is None:
+				selections = ','.join('{0:s}{1:s}{2:s}'.format(operation, majorstr, '.' + minorstr if minorstr else '')
+					for operation, majorstr, minorstr in tokens)
+			raise VersionRangeMismatch('"{0:s}" contains conflicting directives'.format(selections))
+		if selections is not None:
+			selection_cache.put((selections, mx), (inst.min, inst.max, inst.prefer_highest))
+		if start is not None:
+			instrumentation.timed('range_parse', default_timer() - start)
+		return inst
+
+	@classmethod
+	def from_bounds(cls, min, max, prefer_highest=True, mx=VERSION_MAX):
+		"""
+		Create a range directly from encoded bounds, without any parsing or conflict checks.
+		"""
+		inst = cls.__new__(cls)
+		inst.limit = mx
+		inst.min = min
+		inst.max = max
+		inst.prefer_highest = prefer_highest
+		return inst
 
 	@classmethod
 	def raw(cls, min=(0, 0), max=None, min_inclusive=True, max_inclusive=True, prefer_highest=True, conflict='warning', mx=VERSION_MAX):
-		inst=cls(mx=mx)
+		inst = cls.from_bounds(0, (mx + 1) * mx, mx=mx)
 		assert type(min_inclusive) is bool and type(max_inclusive) is bool
 		assert (min is None or type(min) is tuple) and (max is None or type(max) is tuple)
 		assert (min is None or len(min) == 2) and (max is None or len(max) == 2)
@@ -61,25 +287,19 @@ class VersionRange():
 		inst.prefer_highest = prefer_highest
 		return inst
 
-	def to_tup(self, nr):
-		return to_tup(nr, mx=self.limit)
-
-	def to_nr(self, major, minor):
-		return to_nr(major, minor, mx=self.limit)
-
 	def update_values(self, min=None, max=None, conflict='warning'):
 		"""
 		Update the boundaries, handling possible conflicts.
 
-		:param conflict: What to do in case of failure: 'silent', 'warning' or 'error'.
+		:param conflict: What to do in case of failure: 'silent', 'warning', 'error' or a handler for the ConflictEvent.
 		"""
-		conflict_txt = None
+		kind = bounds = None
 		if min is not None:
 			if min > self.min:
 				if min > self.max:
+					kind, bounds = 'min_conflict', (min, self.max)
 					self.max = self.highest
 					self.prefer_highest = False
-					conflict_txt = 'Minimum {0:s} conflicts with maximum {1:s}; minimum is higher so it takes precedence, but lower values in range are not preferred.'.format('{0:d}.{1:d}'.format(*self.to_tup(min)), '{0:d}.{1:d}'.format(*self.to_tup(self.max)))
 				self.min = min
 		if max is not None:
 			if max < self.max:
@@ -87,9 +307,12 @@ class VersionRange():
 					self.max = max
 				else:
 					self.prefer_highest = False
-					conflict_txt = 'Maximum {0:s} conflicts with minimum {1:s}; minimum is higher so takes it precedence, but lower values in range are now preferred.'.format('{0:d}.{1:d}'.format(*self.to_tup(max)), '{0:d}.{1:d}'.format(*self.to_tup(self.min)))
-		if conflict_txt:
-			version_problem_notify(conflict_txt, conflict=conflict)
+					kind, bounds = 'max_conflict', (max, self.min)
+		if kind is not None:
+			if instrumentation.enabled:
+				instrumentation.count('conflict')
+			if conflict != 'silent':
+				version_problem_notify(ConflictEvent(kind, bounds=bounds, mx=self.limit), conflict=conflict)
 
 	def add_selections(self, selections, conflict = 'warning'):
 		if '_' in selections:
@@ -103,7 +326,7 @@ class VersionRange():
 		Restrict the range given a selection string
 
 		:param selection: A single selection (without comma), like '>=1.3'.
-		:param conflict: What to do in case of failure: 'silent', 'warning' or 'error'.
+		:param conflict: What to do in case of failure: 'silent', 'warning', 'error' or a handler for the ConflictEvent.
 		"""
 		selection = selection.replace(' ', '').replace('=.', '=0.')
 		if not selection:
@@ -114,11 +337,19 @@ class VersionRange():
 		if selection.count('.') > 1:
 			raise VersionFormatError(('Version string "{0:s}" is incorrect. Perhaps it contains a version longer than 2 numbers ' +
 				'(e.g. "3.14)" which is intentionally not supported. Version numbers beyond the second are for bugfixes only.').format(selection))
-		regex = r'^([><=]=?)(\d+|\*)(?:\.(\d*|\*))?$'
-		found = findall(regex, selection)
+		found = SELECTION_REGEX.match(selection)
 		if not found:
-			raise VersionFormatError('Version string "{0:s}" not properly formatted according to "{1:s}".'.format(selection, regex))
-		operation, majorstr, minorstr = found[0]
+			raise VersionFormatError('Version string "{0:s}" not properly formatted according to "{1:s}".'.format(selection, SELECTION_REGEX.pattern))
+		operation, majorstr, minorstr = found.groups(default='')
+		self.apply_selection(operation, majorstr, minorstr, conflict=conflict)
+
+	def apply_selection(self, operation, majorstr, minorstr, conflict='warning'):
+		"""
+		Restrict the range given an already split selection, like ('>=', '1', '3') for '>=1.3'.
+
+		:param minorstr: The minor version, '*' or an empty string if there is none.
+		:param conflict: What to do in case of failure: 'silent', 'warning', 'error' or a handler for the ConflictEvent.
+		"""
 		if majorstr == '*':
 			return
 		major = int(majorstr)
@@ -145,137 +376,137 @@ class VersionRange():
 				min = nr + exclusive + exclusive * (major_only * self.limit - major_only),
 			)
 		else:
-			raise VersionFormatError('Version (in)equality operator "{0:s}" not recognized. ' +
-				'Full operation "{1:s}"'.format(operation, selection))
+			raise VersionFormatError(('Version (in)equality operator "{0:s}" not recognized. ' +
+				'Full operation "{0:s}{1:s}{2:s}"').format(operation, majorstr, '.' + minorstr if minorstr else ''))
 
-	def choose(self, versions, conflict='silent'):
+	def intersection(self, other, conflict='warning'):
+		if not type(self) is type(other):
+			raise NotImplementedError('can only take intersection with other {0:s} objects, not {1:s}.'
+				.format(str(type(self)), str(type(other))))
+		intersection = self.from_bounds(0, self.highest, self.prefer_highest and other.prefer_highest, mx=self.limit)
+		intersection.update_values(min=self.min, max=self.max, conflict=conflict)
+		intersection.update_values(min=other.min, max=other.max, conflict=conflict)
+		return intersection
+
+	def __and__(self, other):
+		return self.intersection(other, conflict='silent')
+
+	def freeze(self):
 		"""
-		Choose the highest version in the range.
+		An immutable, hashable and interned copy of this range.
+		"""
+		return FrozenVersionRange(self.min, self.max, self.prefer_highest, mx=self.limit)
+
+
+class FrozenVersionRange(BaseVersionRange):
+	"""
+	Immutable and hashable version range, which can be used as dictionary key or in sets.
+
+	Instances are interned, so creating a range with the same bounds again gives the same object.
+	Silent intersections are cached in `intersection_cache`.
+	"""
+	__slots__ = ('min', 'max', 'prefer_highest', 'limit', '__weakref__')
+	interned = WeakValueDictionary()
+
+	def __new__(cls, min, max, prefer_highest=True, mx=VERSION_MAX):
+		key = (min, max, prefer_highest, mx)
+		inst = cls.interned.get(key)
+		if inst is None:
+			inst = super(FrozenVersionRange, cls).__new__(cls)
+			object.__setattr__(inst, 'min', min)
+			object.__setattr__(inst, 'max', max)
+			object.__setattr__(inst, 'prefer_highest', prefer_highest)
+			object.__setattr__(inst, 'limit', mx)
+			cls.interned[key] = inst
+		return inst
 
-		:param versions: Iterable of available versions.
+	@classmethod
+	def parse(cls, selections='==*', mx=VERSION_MAX):
 		"""
-		assert conflict in ('silent', 'warning', 'error')
-		if not versions:
-			raise VersionRangeMismatch('No versions to choose from')
-		version_map = {}
-		for version in versions:
-			version_map[version] = str2nr(version, mx=self.limit)
-		top_version, top_nr = None, 0
-		""" Try to find the highest value in range. """
-		for version, nr in version_map.items():
-			if nr >= top_nr:
-				if self.min <= nr <= self.max:
-					top_version, top_nr = version, nr
-		if top_version:
-			return top_version
-		""" We need to look outside the range, so maybe give a warning. """
-		version_problem_notify('No matching version found for range "{0:s}" from options "{1:s}"; other options might be considered.'.format(
-			str(self), '/'.join(str(v) for v in versions)), conflict=conflict)
-		""" Failing the above, try to find the lowest value above the range. """
-		top_nr = self.highest
-		for version, nr in version_map.items():
-			if nr < top_nr:
-				if nr >= self.max:
-					top_version, top_nr = version, nr
-		if top_version:
-			return top_version
-		""" Failing the above two, try to highest value below the range (so just the highest). """
-		top_nr = 0
-		for version, nr in version_map.items():
-			if nr > top_nr:
-				top_version, top_nr = version, nr
-		if top_version:
-			return top_version
+		:param selections: A selection string, like '>=1.3,<2.0'.
+		"""
+		return VersionRange(selections, mx=mx).freeze()
 
-	def __eq__(self, other):
-		if not type(self) is type(other):
-			return False
-		if not self.min == other.min:
-			return False
-		if not self.max == other.max:
-			return False
-		if self.min > 0:
-			if not self.prefer_highest == other.prefer_highest:
-				return False
-		return True
+	def __setattr__(self, name, value):
+		raise AttributeError('{0:s} is immutable'.format(self.__class__.__name__))
+
+	def __delattr__(self, name):
+		raise AttributeError('{0:s} is immutable'.format(self.__class__.__name__))
+
+	def __hash__(self):
+		return hash((self.min, self.max, self.prefer_highest or self.min <= 0))
+
+	def __reduce__(self):
+		return self.__class__, (self.min, self.max, self.prefer_highest, self.limit)
+
+	def __copy__(self):
+		return self
+
+	def __deepcopy__(self, memo):
+		return self
+
+	def thaw(self):
+		"""
+		A mutable `VersionRange` with the same bounds.
+		"""
+		return VersionRange.from_bounds(self.min, self.max, self.prefer_highest, mx=self.limit)
 
 	def intersection(self, other, conflict='warning'):
 		if not type(self) is type(other):
 			raise NotImplementedError('can only take intersection with other {0:s} objects, not {1:s}.'
 				.format(str(type(self)), str(type(other))))
-		intersection = VersionRange.raw()
-		intersection.prefer_highest = self.prefer_highest and other.prefer_highest
-		intersection.update_values(min=self.min, max=self.max, conflict=conflict)
-		intersection.update_values(min=other.min, max=other.max, conflict=conflict)
+		key = (self.min, self.max, self.prefer_highest, other.min, other.max, other.prefer_highest, self.limit)
+		if conflict == 'silent':
+			intersection = intersection_cache.get(key)
+			if intersection is not None:
+				return intersection
+		intersection = self.thaw().intersection(other.thaw(), conflict=conflict).freeze()
+		intersection_cache.put(key, intersection)
 		return intersection
 
 	def __and__(self, other):
 		return self.intersection(other, conflict='silent')
 
-	def __str__(self):
-		if self.min <= 0 and self.max >= self.highest:
-			return '==*'
-		min1, min2 = self.to_tup(self.min)
-		if self.min == self.max:
-			return '=={0:d}.{1:d}'.format(min1, min2)
-		max1, max2 = self.to_tup(self.max)
-		parts = []
-		if self.min > 0:
-			parts.append(
-				'>={0:d}.{1:d}'.format(min1, min2)
-			)
-			if self.max < self.highest:
-				parts.append(',')
-		if self.max < self.highest:
-			if max2 == self.limit - 1:
-				if min2 == 0 and min1 == max1 - 2:
-					return '=={0:d}.*'.format(min1)
-				else:
-					parts.append(
-						'<{0:d}.0'.format(max1 + 1)
-					)
-			else:
-				parts.append(
-					'<={0:d}.{1:d}'.format(max1, max2)
-				)
-		if not self.prefer_highest and self.min > 0:
-			parts.append('_')
-		return ''.join(parts)
-
-	def __repr__(self):
-		return '{1:s}({0:s})'.format(self.__str__(), self.__class__.__name__)
-
-	def __format__(self, format_spec):
-		if format_spec == 's':
-			return str(self)
-		return super(VersionRange, self).__format__(format_spec)
 
 
 def parse_dependency(txt):
-	txt = txt.split('#')[0].strip().lower()
-	if not txt:
+	result = scan_dependency(txt)
+	if result is None:
 		return None
-	try:
-		name, versions = findall(r'^{0:s}$'.format(PACKAGE_RANGE_PATTERN), txt)[0]
-	except IndexError:
-		raise VersionFormatError(('Given text "{0:s}" does not seem to be formatted correctly ' +
-			'(according to pattern "{1:s}")"').format(txt, PACKAGE_RANGE_PATTERN))
-	vrange = VersionRange(versions)
+	name, versions = result
+	vrange = VersionRange.from_tokens(iter_selection_tokens(versions), selections=versions)
 	return name, vrange
 
 
+def merge_dependencies(dependencies, duplicates='silent'):
+	"""
+	Collect (name, range) pairs by name, taking the intersection of ranges for names that appear more than once.
+
+	:param dependencies: Iterable of (name, range) pairs, which is consumed one at a time.
+	:param duplicates: What to do for repeated names: 'silent', 'warning', 'error' or a handler for the ConflictEvent.
+	"""
+	merged = OrderedDict()
+	for name, range in dependencies:
+		if name in merged:
+			if instrumentation.enabled:
+				instrumentation.count('dependency_duplicates')
+			if duplicates != 'silent':
+				version_problem_notify(ConflictEvent('duplicate', package=name, ranges=(merged[name], range), mx=range.limit),
+					conflict=duplicates)
+			merged[name] = merged[name] & range
+		else:
+			merged[name] = range
+	return merged
+
+
 def parse_dependencies(txt, duplicates='silent'):
-	dependencies = OrderedDict()
-	for line in txt.splitlines():
-		result = parse_dependency(line)
-		if result:
-			name, range = result
-			if name in dependencies:
-				version_problem_notify('Package with name "{0:s}" appeared twice: "{1:s}" and "{2:s}"'
-					.format(name, dependencies[name], range), conflict=duplicates)
-				dependencies[name] = dependencies[name] & range
-			else:
-				dependencies[name] = range
+	start = default_timer() if instrumentation.enabled else None
+	lines = txt.splitlines()
+	dependencies = merge_dependencies((result for result in (parse_dependency(line) for line in lines) if result),
+		duplicates=duplicates)
+	if start is not None:
+		instrumentation.count('dependency_lines', len(lines))
+		instrumentation.timed('parse_dependencies', default_timer() - start)
 	return dependencies
 
 
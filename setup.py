@@ -43,4 +43,12 @@ setup(
 	install_requires=[
 		# pytest for tests
 	],
+	extras_require={
+		'numpy': ['numpy'],
+	},
+	entry_points={
+		'console_scripts': [
+			'package-versions=package_versions.cli:main',
+		],
+	},
 )